@@ -2,16 +2,46 @@ import pandas as pd
 import plotly.express as px
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, ClientsideFunction
 import dash_bootstrap_components as dbc
+from flask import Blueprint, Response, g, has_request_context, jsonify, request
 from datetime import timedelta
 import numpy as np
 import plotly.graph_objects as go
-
+import plotly.io as pio
+import plotly.utils
+import base64
+import functools
+import hashlib
+import io
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+from disk_cache import DiskCache
+from process_pool import CallbackPool
+from query_backends import make_backend
+from single_flight import SingleFlight
+
+
+DATA_PATH = os.environ.get('TENNIS_DATA_PATH', 'data/cleaned_atp.csv')
+CLIENTSIDE_FILTERING = os.environ.get('CLIENTSIDE_FILTERING', '0') == '1'
+QUERY_BACKEND = os.environ.get('QUERY_BACKEND', 'pandas')
+HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', '3600'))
+BACKGROUND_CALLBACKS = os.environ.get('BACKGROUND_CALLBACKS', '0') == '1'
+CALLBACK_PROCESSES = int(os.environ.get('CALLBACK_PROCESSES', '0'))
+CALLBACK_QUEUE_SIZE = int(os.environ.get('CALLBACK_QUEUE_SIZE', str(4 * CALLBACK_PROCESSES)))
+CALLBACK_TIMEOUT = float(os.environ.get('CALLBACK_TIMEOUT', '30'))
+# "callback_id=concurrency/queue budget in seconds,..."; callbacks not listed are unlimited.
+CALLBACK_LIMITS = os.environ.get('CALLBACK_LIMITS', 'sunburst-chart.figure=2/0.5,backtest=2/0.5')
 
 try:
     print("Fetching the data...")
-    df = pd.read_csv("data/cleaned_atp.csv")
+    df = pd.read_csv(DATA_PATH)
+    with open(DATA_PATH, 'rb') as f:
+        DATASET_VERSION = hashlib.sha1(f.read()).hexdigest()[:16]
 except FileNotFoundError:
     print("Error: data source not found. Please ensure the file path you provided is correct.")
     df = pd.DataFrame(columns=[
@@ -19,6 +49,16 @@ except FileNotFoundError:
         'Series', 'Court', 'Round', 'Total_sets_needed', 'Score',
         'Break_pts_1', 'Break_pts_2', 'Tournament'
     ])
+    DATASET_VERSION = 'empty'
+
+# Cached figures and every ETag are keyed on this, so it covers the local
+# modules behind a response as well as this file.
+CODE_FILES = ['app.py', 'query_backends.py', 'local_db.py', 'disk_cache.py', 'process_pool.py', 'single_flight.py']
+code_hash = hashlib.sha1()
+for name in CODE_FILES:
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), 'rb') as f:
+        code_hash.update(f.read())
+CODE_VERSION = code_hash.hexdigest()[:16]
 
 df['Date'] = pd.to_datetime(df['Date'])
 df['Year'] = df['Date'].dt.year
@@ -29,21 +69,25 @@ for col in ['Odd_1', 'Odd_2']:
 valid_odds_1 = df[df['Odd_1'] > 0]['Odd_1']
 valid_odds_2 = df[df['Odd_2'] > 0]['Odd_2']
 
+# Missing odds are imputed with a fixed seed so that every worker process ends up
+# with the same frame for a given DATASET_VERSION.
+rng = np.random.default_rng(0)
+
 if not valid_odds_1.empty and not valid_odds_2.empty:
     mean_1, std_1 = valid_odds_1.mean(), valid_odds_1.std()
     mean_2, std_2 = valid_odds_2.mean(), valid_odds_2.std()
     
     def generate_random_odd(value, mean, std):
         if value <= 0 or pd.isna(value):
-            new_val = np.random.normal(mean, std)
+            new_val = rng.normal(mean, std)
             return max(1.01, round(new_val, 2))
         return value
 
     df['Odd_1'] = df['Odd_1'].apply(lambda x: generate_random_odd(x, mean_1, std_1))
     df['Odd_2'] = df['Odd_2'].apply(lambda x: generate_random_odd(x, mean_2, std_2))
 else:
-    df['Odd_1'] = df['Odd_1'].apply(lambda x: np.random.uniform(1.1, 3.5) if x <= 0 else x)
-    df['Odd_2'] = df['Odd_2'].apply(lambda x: np.random.uniform(1.1, 3.5) if x <= 0 else x)
+    df['Odd_1'] = df['Odd_1'].apply(lambda x: rng.uniform(1.1, 3.5) if x <= 0 else x)
+    df['Odd_2'] = df['Odd_2'].apply(lambda x: rng.uniform(1.1, 3.5) if x <= 0 else x)
 
 df_odds = df.dropna(subset=['Odd_1', 'Odd_2']).copy()
 df_odds = df_odds[(df_odds['Odd_1'] > 1.0) & (df_odds['Odd_2'] > 1.0)]
@@ -59,6 +103,64 @@ df_odds['Winner_Odd'] = df_odds.apply(get_winner_odd, axis=1)
 df_odds.dropna(subset=['Winner_Odd'], inplace=True)
 df_odds['Bet_Type'] = df_odds['Winner_Odd'].apply(lambda x: 'Underdog (Odds > 2.0)' if x > 2.0 else 'Favorite (Odds <= 2.0)')
 
+# The odds histogram ships per-bin counts rather than every raw odd; the small
+# epsilon keeps values sitting exactly on a bin edge in the same bin plotly.js would use.
+ODDS_BIN_START, ODDS_BIN_SIZE = 1.0, 0.1
+df_odds['Odds_Bin'] = np.floor((df_odds['Winner_Odd'] - ODDS_BIN_START) / ODDS_BIN_SIZE + 1e-9).astype(int)
+ODDS_AXIS_MAX = df_odds['Winner_Odd'].quantile(0.99) + 0.5
+
+MAX_SETS = 5
+SET_SCORE_PATTERN = r'(\d{1,2})-(\d{1,2})(?:\((\d+)\))?'
+SCORE_PATTERN = r'^\s*' + r'\s*'.join(f'(?:{SET_SCORE_PATTERN})?' for _ in range(MAX_SETS))
+INCOMPLETE_SCORE_PATTERN = r'ret|w/o|walkover|def\.|abn|abandon|unfinished'
+
+def parse_scores(scores, player_1_won):
+    # Turns the free-text Score column into fixed-width per-set arrays oriented as
+    # (Player_1, Player_2). Unplayed sets hold -1. The side that won more sets is
+    # taken to be the winner, so the text may be written from either perspective.
+    scores = scores.fillna('').astype(str)
+    sets = scores.str.extract(SCORE_PATTERN)
+    side_a = sets.iloc[:, 0::3].astype(float).to_numpy()
+    side_b = sets.iloc[:, 1::3].astype(float).to_numpy()
+    marked_tiebreak = sets.iloc[:, 2::3].notna().to_numpy()
+    played = ~np.isnan(side_a)
+
+    sets_a = (side_a > side_b).sum(axis=1)
+    sets_b = (side_b > side_a).sum(axis=1)
+    flip = (sets_a != sets_b) & ((sets_a > sets_b) != player_1_won)
+    games_1 = np.where(flip[:, None], side_b, side_a)
+    games_2 = np.where(flip[:, None], side_a, side_b)
+
+    games = np.stack([games_1, games_2], axis=2)
+    games = np.where(played[:, :, None], games, -1).astype(np.int8)
+    low, high = np.fmin(side_a, side_b), np.fmax(side_a, side_b)
+    tiebreak = played & (marked_tiebreak | ((low == 6) & (high == 7)))
+    incomplete = scores.str.contains(INCOMPLETE_SCORE_PATTERN, case=False).to_numpy() | ~played[:, 0]
+    return {'games': games, 'tiebreak': tiebreak, 'incomplete': incomplete}
+
+score_arrays = parse_scores(df['Score'], (df['Winner'] == df['Player_1']).to_numpy())
+
+def player_score_stats(player_name):
+    player = player_rows(player_name)
+    rows = player['Match'].to_numpy()
+    games = score_arrays['games'][rows]
+    as_player_1 = (player['Side'] == 0).to_numpy()[:, None]
+    own = np.where(as_player_1, games[:, :, 0], games[:, :, 1])
+    opponent = np.where(as_player_1, games[:, :, 1], games[:, :, 0])
+    played = own >= 0
+
+    games_won = own[played].sum()
+    games_total = games_won + opponent[played].sum()
+    tiebreaks = score_arrays['tiebreak'][rows]
+    complete_wins = player['Win'].to_numpy() & ~score_arrays['incomplete'][rows]
+    sets_dropped = (played & (opponent > own)).sum(axis=1)
+    return {
+        'games_won_pct': games_won / games_total * 100 if games_total else 0.0,
+        'tiebreaks_won': int((tiebreaks & (own > opponent)).sum()),
+        'tiebreaks_lost': int((tiebreaks & (own < opponent)).sum()),
+        'straight_sets_pct': (complete_wins & (sets_dropped == 0)).sum() / complete_wins.sum() * 100 if complete_wins.any() else 0.0
+    }
+
 all_players_series = pd.concat([df['Player_1'], df['Player_2']])
 all_players = all_players_series.dropna().astype(str).str.strip().unique()
 all_players.sort()
@@ -67,8 +169,578 @@ player_options = [{'label': player, 'value': player} for player in all_players]
 all_years = sorted(df['Year'].unique())
 year_options = [{'label': str(year), 'value': year} for year in all_years]
 
+player_index = pd.Index(all_players)
+
+def player_ids(names):
+    return player_index.get_indexer(names.astype(str).str.strip())
+
+df['Player_1_id'] = player_ids(df['Player_1'])
+df['Player_2_id'] = player_ids(df['Player_2'])
+
+SURFACES = ['Hard', 'Clay', 'Grass', 'Carpet']
+SURFACE_COLORS = {'Hard': '#3b82f6', 'Clay': '#ef4444', 'Grass': '#10b981', 'Carpet': '#f59e0b'}
+SERIES_COLORS = {
+    'Grand Slam': '#4c1d95', 'Masters': '#f43f5e', 'ATP500': '#059669',
+    'ATP250': '#6366f1', 'Masters 1000': '#f59e0b', 'International Gold': '#94a3b8',
+    'International': '#f472b6', 'Masters Cup': '#c084fc'
+}
+ROUND_ORDER = {
+    '1st Round': 1, '2nd Round': 2, '3rd Round': 3, '4th Round': 4, 'Round Robin': 4,
+    'Quarterfinals': 5, 'Semifinals': 6, 'Final': 7, 'The Final': 7
+}
+
+ELO_INITIAL = 1500.0
+ELO_K = 32.0
+
+def elo_pass(winner_ids, loser_ids, surface_ids, overall, by_surface, k):
+    # Plain loops over integer ids and float arrays, written so numba can compile
+    # it unchanged. Ratings are updated in place; the returned array holds the
+    # ratings going into each match: winner, loser, winner on surface, loser on surface.
+    n = winner_ids.shape[0]
+    before = np.full((n, 4), np.nan)
+    for i in range(n):
+        w = winner_ids[i]
+        l = loser_ids[i]
+        if w < 0 or l < 0:
+            continue
+        rw = overall[w]
+        rl = overall[l]
+        before[i, 0] = rw
+        before[i, 1] = rl
+        delta = k * (1.0 - 1.0 / (1.0 + 10.0 ** ((rl - rw) / 400.0)))
+        overall[w] = rw + delta
+        overall[l] = rl - delta
+        s = surface_ids[i]
+        if s >= 0:
+            rw = by_surface[s, w]
+            rl = by_surface[s, l]
+            before[i, 2] = rw
+            before[i, 3] = rl
+            delta = k * (1.0 - 1.0 / (1.0 + 10.0 ** ((rl - rw) / 400.0)))
+            by_surface[s, w] = rw + delta
+            by_surface[s, l] = rl - delta
+    return before
+
+try:
+    from numba import njit
+    elo_pass = njit(cache=True)(elo_pass)
+except ImportError:
+    pass
+
+def new_elo_state(n_players):
+    return {
+        'overall': np.full(n_players, ELO_INITIAL),
+        'surface': np.full((len(SURFACES), n_players), ELO_INITIAL)
+    }
+
+def update_elo(state, matches):
+    # Feeds matches (already carrying Player_1_id/Player_2_id) through the engine
+    # in date/round order, continuing from the ratings in state. Returns the
+    # pre-match ratings as Player_1/Player_2 oriented columns aligned with matches.
+    n_players = max(len(state['overall']), int(matches[['Player_1_id', 'Player_2_id']].max().max()) + 1 if len(matches) else 0)
+    if n_players > len(state['overall']):
+        grown = new_elo_state(n_players)
+        grown['overall'][:len(state['overall'])] = state['overall']
+        grown['surface'][:, :len(state['overall'])] = state['surface']
+        state.update(grown)
+
+    order = np.lexsort((matches['Round'].map(ROUND_ORDER).fillna(0).to_numpy(), matches['Date'].to_numpy()))
+    ordered = matches.iloc[order]
+    player_1_won = (ordered['Winner'] == ordered['Player_1']).to_numpy()
+    player_2_won = (ordered['Winner'] == ordered['Player_2']).to_numpy()
+    p1 = ordered['Player_1_id'].to_numpy(dtype=np.int64)
+    p2 = ordered['Player_2_id'].to_numpy(dtype=np.int64)
+    winner_ids = np.where(player_1_won, p1, np.where(player_2_won, p2, -1))
+    loser_ids = np.where(player_1_won, p2, np.where(player_2_won, p1, -1))
+    surface_ids = pd.Index(SURFACES).get_indexer(ordered['Surface']).astype(np.int64)
+
+    before = elo_pass(winner_ids, loser_ids, surface_ids, state['overall'], state['surface'], ELO_K)
+
+    ratings = np.empty_like(before)
+    ratings[order] = np.where(
+        player_1_won[:, None], before, before[:, [1, 0, 3, 2]]
+    )
+    return pd.DataFrame(
+        ratings, index=matches.index, columns=['Elo_1', 'Elo_2', 'Surface_Elo_1', 'Surface_Elo_2']
+    )
+
+elo_state = new_elo_state(len(all_players))
+df[['Elo_1', 'Elo_2', 'Surface_Elo_1', 'Surface_Elo_2']] = update_elo(elo_state, df)
+
+FORM_WINDOW = 10
+PLAYER_MATCH_ORDER = ['Player_id', 'Date', 'Round_Order']
+
+def player_match_rows(matches):
+    # One row per player per match, seen from that player's side, so per-player
+    # code never has to deal with the Player_1/Player_2 symmetry. Match is the df
+    # row label, which is also its position since df keeps a default RangeIndex.
+    def both(column_1, column_2):
+        return np.concatenate([matches[column_1].to_numpy(), matches[column_2].to_numpy()])
+
+    def twice(column):
+        return np.tile(matches[column].to_numpy(), 2)
+
+    rows = pd.DataFrame({
+        'Match': np.tile(matches.index.to_numpy(), 2),
+        'Player_id': both('Player_1_id', 'Player_2_id'),
+        'Opponent_id': both('Player_2_id', 'Player_1_id'),
+        'Side': np.repeat(np.array([0, 1], dtype=np.int8), len(matches)),
+        'Date': twice('Date'),
+        'Round_Order': np.tile(matches['Round'].map(ROUND_ORDER).fillna(0).to_numpy(), 2),
+        'Win': twice('Winner') == both('Player_1', 'Player_2'),
+        'Own_Odd': both('Odd_1', 'Odd_2'),
+        'Opponent_Odd': both('Odd_2', 'Odd_1'),
+        'Own_Break_Pts': pd.to_numeric(pd.concat([matches['Break_pts_1'], matches['Break_pts_2']]), errors='coerce').to_numpy(),
+        'Opponent_Break_Pts': pd.to_numeric(pd.concat([matches['Break_pts_2'], matches['Break_pts_1']]), errors='coerce').to_numpy()
+    })
+    return rows[rows['Player_id'] >= 0]
+
+def add_form_columns(rows):
+    # Expects rows sorted by (Player_id, Date, Round_Order). Every value describes
+    # the player's record up to and including that match.
+    rows = rows.reset_index(drop=True)
+    player = rows['Player_id'].to_numpy()
+    win = rows['Win'].to_numpy()
+    new_player = np.r_[True, player[1:] != player[:-1]]
+    position = rows.groupby('Player_id').cumcount().to_numpy()
+
+    wins_so_far = rows.groupby('Player_id')['Win'].cumsum().to_numpy()
+    window_start = np.where(position >= FORM_WINDOW, np.arange(len(rows)) - FORM_WINDOW, -1)
+    rows['Form_Wins'] = wins_so_far - np.where(window_start >= 0, wins_so_far[np.maximum(window_start, 0)], 0)
+    rows['Form_Matches'] = np.minimum(position + 1, FORM_WINDOW)
+
+    run = np.cumsum(new_player | np.r_[True, win[1:] != win[:-1]])
+    run_length = pd.Series(run).groupby(run).cumcount().to_numpy() + 1
+    rows['Streak'] = np.where(win, run_length, -run_length)
+    rows['Longest_Win_Streak'] = pd.Series(np.where(win, run_length, 0)).groupby(player).cummax().to_numpy()
+    return rows
+
+def update_player_form(table, matches):
+    # Appends matches to the player-match table and recomputes the form columns
+    # for the players who appear in them; everyone else's rows are left as they are.
+    new_rows = player_match_rows(matches)
+    affected = table['Player_id'].isin(new_rows['Player_id'].unique())
+    rows = pd.concat([table.loc[affected, new_rows.columns], new_rows], ignore_index=True)
+    rows = add_form_columns(rows.sort_values(PLAYER_MATCH_ORDER, kind='stable'))
+    table = pd.concat([table.loc[~affected], rows], ignore_index=True)
+    return table.sort_values(PLAYER_MATCH_ORDER, kind='stable', ignore_index=True)
+
+def index_player_matches(table):
+    # Row offsets per player, plus a (player, opponent) ordering in which each
+    # pairing's meetings are one contiguous, date-ordered run.
+    player = table['Player_id'].to_numpy()
+    n_players = int(player.max()) + 1 if len(player) else 0
+    pair_keys = player.astype(np.int64) * (n_players + 1) + table['Opponent_id'].to_numpy() + 1
+    pair_order = np.argsort(pair_keys, kind='stable')
+    return {
+        'starts': np.searchsorted(player, np.arange(n_players + 1)),
+        'pair_keys': pair_keys[pair_order],
+        'pair_order': pair_order,
+        'n_players': n_players
+    }
+
+def build_break_point_stats(table):
+    # Break point sums per (player, surface, year) and per (player, opponent),
+    # from the player-oriented columns. Matches without break point data are left out.
+    rows = table[table['Own_Break_Pts'].notna() & table['Opponent_Break_Pts'].notna()]
+    sums = pd.DataFrame({
+        'Player_id': rows['Player_id'].to_numpy(),
+        'Opponent_id': rows['Opponent_id'].to_numpy(),
+        'Surface': df['Surface'].to_numpy()[rows['Match'].to_numpy()],
+        'Year': rows['Date'].dt.year.to_numpy(),
+        'Matches': 1,
+        'Own': rows['Own_Break_Pts'].to_numpy(),
+        'Opponent': rows['Opponent_Break_Pts'].to_numpy()
+    })
+    columns = ['Matches', 'Own', 'Opponent']
+    # Lookups go through row offsets and sorted integer keys rather than .loc on
+    # the MultiIndex, whose lazily built lookup state is not safe to share
+    # between request threads.
+    by_surface_year = sums.groupby(['Player_id', 'Surface', 'Year'])[columns].sum()
+    h2h = sums.groupby(['Player_id', 'Opponent_id'])[columns].sum()
+    n_players = player_match_index['n_players']
+    return {
+        'by_surface_year': by_surface_year,
+        'player_starts': np.searchsorted(by_surface_year.index.get_level_values('Player_id').to_numpy(), np.arange(n_players + 1)),
+        'h2h_keys': h2h.index.get_level_values('Player_id').to_numpy() * (n_players + 1) + h2h.index.get_level_values('Opponent_id').to_numpy() + 1,
+        'h2h': h2h.to_numpy()
+    }
+
+player_matches = add_form_columns(player_match_rows(df).sort_values(PLAYER_MATCH_ORDER, kind='stable'))
+player_match_index = index_player_matches(player_matches)
+break_point_stats = build_break_point_stats(player_matches)
+
+CAREER_STATS = ['Matches', 'Wins', 'Titles']
+
+def build_career_cube(table):
+    # Dense (player, year, surface, stat) counts filled with one bincount per stat.
+    # The last surface slot collects matches with an unknown surface so yearly
+    # totals stay complete.
+    years = np.asarray(all_years)
+    n_players = player_match_index['n_players']
+    match_rows = table['Match'].to_numpy()
+    year_ids = np.searchsorted(years, table['Date'].dt.year.to_numpy())
+    surface_ids = pd.Index(SURFACES).get_indexer(df['Surface'].to_numpy()[match_rows])
+    surface_ids = np.where(surface_ids >= 0, surface_ids, len(SURFACES))
+    key = (table['Player_id'].to_numpy() * len(years) + year_ids) * (len(SURFACES) + 1) + surface_ids
+    win = table['Win'].to_numpy()
+    title = win & (df['Round'].to_numpy()[match_rows] == 'Final')
+    size = n_players * len(years) * (len(SURFACES) + 1)
+    cube = np.stack([np.bincount(key[mask], minlength=size) for mask in [np.ones(len(win), dtype=bool), win, title]], axis=-1)
+    return cube.reshape(n_players, len(years), len(SURFACES) + 1, len(CAREER_STATS)).astype(np.uint16)
+
+career_cube = build_career_cube(player_matches)
+
+def player_id(player_name):
+    return player_index.get_loc(player_name) if player_name in player_index else -1
+
+def player_rows(player_name):
+    pid = player_id(player_name)
+    if not 0 <= pid < player_match_index['n_players']:
+        return player_matches.iloc[:0]
+    starts = player_match_index['starts']
+    return player_matches.iloc[starts[pid]:starts[pid + 1]]
+
+SIMILARITY_MIN_MATCHES = 20
+SIMILARITY_TOP_K = 5
+
+def build_player_features(table):
+    # One float32 row per player id: win rate per surface, average odds as
+    # favorite and as underdog, upset rate, finals conversion and the share of
+    # matches reached in each round. Columns are standardized and rows unit
+    # length, so cosine similarity is a plain dot product.
+    n_players = player_match_index['n_players']
+    player = table['Player_id'].to_numpy()
+    win = table['Win'].to_numpy()
+    own_odd = table['Own_Odd'].to_numpy(dtype=float)
+    opponent_odd = table['Opponent_Odd'].to_numpy(dtype=float)
+    round_order = table['Round_Order'].to_numpy().astype(np.int64)
+    surface_ids = pd.Index(SURFACES).get_indexer(df['Surface'].to_numpy()[table['Match'].to_numpy()])
+
+    def count(mask, weights=None):
+        return np.bincount(player[mask], weights=None if weights is None else weights[mask], minlength=n_players)
+
+    def rate(numerator, denominator):
+        return np.divide(numerator, denominator, out=np.full(n_players, np.nan), where=denominator > 0)
+
+    matches = count(np.ones(len(player), dtype=bool))
+    favorite = own_odd < opponent_odd
+    underdog = own_odd > opponent_odd
+    final = round_order == ROUND_ORDER['Final']
+    columns = [rate(count(win & (surface_ids == s)), count(surface_ids == s)) for s in range(len(SURFACES))]
+    columns += [
+        rate(count(favorite, own_odd), count(favorite)),
+        rate(count(underdog, own_odd), count(underdog)),
+        rate(count(underdog & win), count(underdog)),
+        rate(count(final & win), count(final))
+    ]
+    columns += [rate(count(round_order == r), matches) for r in range(1, ROUND_ORDER['Final'] + 1)]
+
+    features = np.column_stack(columns) if n_players else np.zeros((0, len(columns)))
+    eligible = matches >= SIMILARITY_MIN_MATCHES
+    if eligible.any():
+        mean = np.nanmean(features[eligible], axis=0)
+        std = np.nanstd(features[eligible], axis=0)
+        features = np.nan_to_num((features - mean) / np.where(std > 0, std, 1.0))
+    features[~eligible] = 0.0
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return (features / np.where(norms > 0, norms, 1.0)).astype(np.float32), eligible
+
+player_features, similarity_eligible = build_player_features(player_matches)
+
+def similar_players(player_name, k=SIMILARITY_TOP_K):
+    pid = player_id(player_name)
+    if not 0 <= pid < len(player_features) or not similarity_eligible[pid]:
+        return []
+    scores = player_features @ player_features[pid]
+    scores[~similarity_eligible] = -np.inf
+    scores[pid] = -np.inf
+    k = min(k, int(similarity_eligible.sum()) - 1)
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return [(player_index[i], float(scores[i])) for i in top]
+
+def build_draws(table):
+    # Every (Tournament, Year) edition as a bracket, stored as flat arrays sorted
+    # by (edition, round, slot): the df row of each match, its round, its vertical
+    # position in [0, 1) and the index of the match its winner played next.
+    if df.empty:
+        return {
+            'editions': [], 'starts': np.zeros(1, dtype=np.int64), 'match': np.zeros(0, dtype=np.int32),
+            'round': np.zeros(0, dtype=np.int8), 'y': np.zeros(0, dtype=np.float32), 'parent': np.zeros(0, dtype=np.int32)
+        }
+    edition_codes, editions = pd.factorize(pd.MultiIndex.from_arrays([df['Tournament'], df['Year']]), sort=True)
+    edition = edition_codes[table['Match'].to_numpy()]
+    rows = table.assign(Edition=edition)[edition >= 0].sort_values(['Edition', 'Player_id', 'Round_Order', 'Date'], kind='stable')
+    same_run = (rows['Edition'].to_numpy()[1:] == rows['Edition'].to_numpy()[:-1]) & (rows['Player_id'].to_numpy()[1:] == rows['Player_id'].to_numpy()[:-1])
+    next_match = np.where(same_run, rows['Match'].to_numpy()[1:], -1)
+    next_match = np.append(next_match, -1)
+    advances = rows['Win'].to_numpy() & (np.append(rows['Round_Order'].to_numpy()[1:], 0) > rows['Round_Order'].to_numpy()) & (next_match >= 0)
+
+    n = len(df)
+    parent = np.full(n, -1)
+    parent[rows['Match'].to_numpy()[advances]] = next_match[advances]
+    round_order = df['Round'].map(ROUND_ORDER).fillna(0).to_numpy().astype(np.int8)
+
+    # Walk down from the final: each round is laid out in its parents' order, so
+    # children sit next to each other and a full draw lines up as a bracket.
+    y = np.full(n, np.nan)
+    for level in sorted(set(round_order[edition_codes >= 0]), reverse=True):
+        members = np.flatnonzero((round_order == level) & (edition_codes >= 0))
+        parent_y = np.where(parent[members] >= 0, y[np.maximum(parent[members], 0)], 2.0)
+        members = members[np.lexsort((members, parent_y, edition_codes[members]))]
+        member_editions = edition_codes[members]
+        slot = pd.Series(member_editions).groupby(member_editions).cumcount().to_numpy()
+        count = np.bincount(member_editions, minlength=len(editions))[member_editions]
+        y[members] = (slot + 0.5) / count
+
+    order = np.flatnonzero(edition_codes >= 0)
+    order = order[np.lexsort((y[order], round_order[order], edition_codes[order]))]
+    position = np.full(n, -1)
+    position[order] = np.arange(len(order))
+    return {
+        'editions': [f"{tournament} {year}" for tournament, year in editions],
+        'starts': np.searchsorted(edition_codes[order], np.arange(len(editions) + 1)),
+        'match': order.astype(np.int32),
+        'round': round_order[order],
+        'y': y[order].astype(np.float32),
+        'parent': np.where(parent[order] >= 0, position[np.maximum(parent[order], 0)], -1).astype(np.int32)
+    }
+
+def edition_options(draws):
+    return [
+        {'label': label, 'value': i}
+        for i, label in sorted(enumerate(draws['editions']), key=lambda item: (-int(item[1].rsplit(' ', 1)[1]), item[1]))
+    ]
+
+draws = build_draws(player_matches)
+draw_options = edition_options(draws)
+
+def refresh_player_tables(matches):
+    # Folds matches already appended to df, with their player ids and Elo, into
+    # the per-player tables: form and streaks are recomputed only for the players
+    # in them, then the row index and the tables read through it are rebuilt.
+    # Whole-dataset state (DATASET_VERSION, all_years, the odds tables, the query
+    # backend) is left to the caller.
+    global player_matches, player_match_index, break_point_stats, career_cube
+    global player_features, similarity_eligible, draws
+    player_matches = update_player_form(player_matches, matches)
+    player_match_index = index_player_matches(player_matches)
+    break_point_stats = build_break_point_stats(player_matches)
+    career_cube = build_career_cube(player_matches)
+    player_features, similarity_eligible = build_player_features(player_matches)
+    draws = build_draws(player_matches)
+    # Updated in place: the edition dropdown in the layout holds this list.
+    draw_options[:] = edition_options(draws)
+
+def h2h_rows(player1, player2):
+    # Meetings seen from player1's side, in date order.
+    pid1, pid2 = player_id(player1), player_id(player2)
+    if pid1 < 0 or pid2 < 0:
+        return player_matches.iloc[:0]
+    key = pid1 * (player_match_index['n_players'] + 1) + pid2 + 1
+    keys = player_match_index['pair_keys']
+    lo, hi = np.searchsorted(keys, key, side='left'), np.searchsorted(keys, key, side='right')
+    return player_matches.iloc[player_match_index['pair_order'][lo:hi]]
+
+def encode_dimension(values):
+    codes, labels = pd.factorize(values, sort=True)
+    return codes, [label.item() if isinstance(label, np.generic) else label for label in labels]
+
+def encode_column(values):
+    values = np.asarray(values)
+    dtype = np.min_scalar_type(values.max()) if len(values) else np.dtype('uint8')
+    dtype = np.dtype(dtype).newbyteorder('<')
+    return {'dtype': dtype.name, 'bdata': base64.b64encode(values.astype(dtype).tobytes()).decode('ascii')}
+
+def build_filter_cube():
+    # Everything the Series Kings and sunburst charts need, pre-aggregated into
+    # integer-coded columns so the browser can re-filter without a server round-trip.
+    if df.empty:
+        return None
+    surface_codes, surfaces = encode_dimension(df['Surface'])
+    series_codes, series = encode_dimension(df['Series'])
+    court_codes, courts = encode_dimension(df['Court'])
+    round_codes, rounds = encode_dimension(df['Round'])
+    sets_codes, sets_needed = encode_dimension(df['Total_sets_needed'])
+    winner_codes, winners = encode_dimension(df['Winner'])
+    origin = df['Date'].min()
+    codes = pd.DataFrame({
+        'w': winner_codes, 's': surface_codes, 'se': series_codes, 'c': court_codes,
+        'd': (df['Date'] - origin).dt.days.to_numpy(), 'r': round_codes, 't': sets_codes
+    })
+    kings = codes[codes['w'] >= 0].groupby(['d', 'w', 's', 'se', 'c']).size().reset_index(name='n')
+    paths = codes[(codes['r'] >= 0) & (codes['t'] >= 0)].groupby(['d', 's', 'se', 'c', 'r', 't']).size().reset_index(name='n')
+
+    def day_index(rows):
+        # Rows are sorted by day, so the day column is replaced by each distinct
+        # day and the offset of its first row: a date range becomes one slice.
+        days, starts = np.unique(rows['d'].to_numpy(), return_index=True)
+        return {'d': encode_column(days), 'start': encode_column(np.append(starts, len(rows)))}
+
+    return {
+        'origin': origin.strftime('%Y-%m-%d'),
+        'winners': winners,
+        'surfaces': surfaces,
+        'series': series,
+        'courts': courts,
+        'rounds': rounds,
+        'sets': [str(value) for value in sets_needed],
+        'kings': {col: encode_column(kings[col]) for col in kings.columns if col != 'd'},
+        'kings_days': day_index(kings),
+        'paths': {col: encode_column(paths[col]) for col in paths.columns if col != 'd'},
+        'paths_days': day_index(paths)
+    }
+
+filter_cube_store = dcc.Store(id='filter-cube')
+
+CALIBRATION_BUCKETS = 20
+CALIBRATION_MIN_COUNT = 20
+
+def build_calibration(odds, categories):
+    # Implied win probabilities with the bookmaker margin removed, one observation
+    # per player per match, aggregated per (category value, probability bucket)
+    # with a single bincount each. The upset index is how often underdogs won
+    # relative to how often their odds said they would.
+    inverse_1 = 1.0 / odds['Odd_1'].to_numpy(dtype=float)
+    inverse_2 = 1.0 / odds['Odd_2'].to_numpy(dtype=float)
+    prob_1 = inverse_1 / (inverse_1 + inverse_2)
+    prob = np.concatenate([prob_1, 1.0 - prob_1])
+    won = np.concatenate([(odds['Winner'] == odds['Player_1']).to_numpy(), (odds['Winner'] == odds['Player_2']).to_numpy()])
+    bucket = np.minimum((prob * CALIBRATION_BUCKETS).astype(np.int64), CALIBRATION_BUCKETS - 1)
+    underdog = prob < 0.5
+
+    tables = {}
+    for category in categories:
+        codes, labels = encode_dimension(np.tile(odds[category].to_numpy(), 2))
+        keep = codes >= 0
+        key = codes[keep] * CALIBRATION_BUCKETS + bucket[keep]
+        size = len(labels) * CALIBRATION_BUCKETS
+
+        def binned(weights=None):
+            return np.bincount(key, weights=None if weights is None else weights[keep], minlength=size).reshape(len(labels), CALIBRATION_BUCKETS)
+
+        upsets = keep & underdog
+        expected = np.bincount(codes[upsets], weights=prob[upsets], minlength=len(labels))
+        tables[category] = {
+            'labels': labels,
+            'count': binned(),
+            'wins': binned(won.astype(float)),
+            'prob': binned(prob),
+            'upset_index': np.divide(
+                np.bincount(codes[upsets], weights=won[upsets], minlength=len(labels)), expected,
+                out=np.full(len(labels), np.nan), where=expected > 0
+            )
+        }
+    return tables
+
+calibration = build_calibration(df_odds, ['Surface', 'Series'])
+
+BACKTEST_SIDES = ['Favorite', 'Underdog']
+
+def build_backtest_data(odds):
+    # One flat-stake bet per match, laid out in date order. Row 0 of the 2 x N
+    # arrays is backing the favorite, row 1 backing the underdog.
+    frame = odds.sort_values('Date', kind='stable')
+    odd_1 = frame['Odd_1'].to_numpy(dtype=float)
+    odd_2 = frame['Odd_2'].to_numpy(dtype=float)
+    favorite_is_1 = odd_1 <= odd_2
+    favorite_won = favorite_is_1 == (frame['Winner'] == frame['Player_1']).to_numpy()
+    favorite_odd = np.where(favorite_is_1, odd_1, odd_2)
+    underdog_odd = np.where(favorite_is_1, odd_2, odd_1)
+    surface_codes, surfaces = encode_dimension(frame['Surface'])
+    series_codes, series = encode_dimension(frame['Series'])
+    round_codes, rounds = encode_dimension(frame['Round'])
+    # Surface, series and round collapse into one cell code so a strategy's
+    # filters cost a single gather. Code 0 on each axis is "missing".
+    cell = ((surface_codes + 1) * (len(series) + 1) + series_codes + 1) * (len(rounds) + 1) + round_codes + 1
+    return {
+        'dates': frame['Date'].to_numpy(),
+        'cell': cell,
+        'surfaces': np.array(surfaces, dtype=object),
+        'series_labels': np.array(series, dtype=object),
+        'rounds': np.array(rounds, dtype=object),
+        'odds': np.stack([favorite_odd, underdog_odd]),
+        'won': np.stack([favorite_won, ~favorite_won]),
+        'profit': np.stack([
+            np.where(favorite_won, favorite_odd - 1.0, -1.0),
+            np.where(favorite_won, -1.0, underdog_odd - 1.0)
+        ])
+    }
+
+backtest_data = build_backtest_data(df_odds)
+
+def strategy_masks(strategies, data):
+    count = len(strategies)
+
+    def allowed(key, labels):
+        table = np.zeros((count, len(labels) + 1), dtype=bool)
+        for i, strategy in enumerate(strategies):
+            table[i, 1:] = np.isin(labels, strategy[key]) if strategy.get(key) else True
+        return table
+
+    cells = (
+        allowed('surfaces', data['surfaces'])[:, :, None, None] &
+        allowed('series', data['series_labels'])[:, None, :, None] &
+        allowed('rounds', data['rounds'])[:, None, None, :]
+    ).reshape(count, -1)
+    sides = np.array([BACKTEST_SIDES.index(strategy.get('side', 'Favorite')) for strategy in strategies])
+    min_odds = np.array([strategy.get('min_odds', 1.0) for strategy in strategies])[:, None]
+    max_odds = np.array([strategy.get('max_odds', np.inf) for strategy in strategies])[:, None]
+    odds = data['odds'][sides]
+    return cells[:, data['cell']] & (odds >= min_odds) & (odds <= max_odds), sides
+
+def backtest(strategies, with_curves=False, data=None, chunk_size=16):
+    # Evaluates every strategy (a dict of surfaces/series/rounds filters, a side
+    # and an odds band on that side) against the whole history at once. Only
+    # the placed bets are kept: one flat cumsum runs over all strategies and is
+    # rebased at each strategy's first bet.
+    data = backtest_data if data is None else data
+    count = len(strategies)
+    result = {
+        'bets': np.zeros(count, dtype=np.int64),
+        'hits': np.zeros(count, dtype=np.int64),
+        'profit': np.zeros(count),
+        'max_drawdown': np.zeros(count)
+    }
+    curves = []
+    for start in range(0, count, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        masks, sides = strategy_masks(strategies[chunk], data)
+        rows, positions = np.nonzero(masks)
+        side_rows = sides[rows]
+        profit = data['profit'][side_rows, positions]
+        bets = np.bincount(rows, minlength=len(masks))
+        ends = np.cumsum(bets)
+        starts = ends - bets
+        running = np.cumsum(profit)
+        base = np.concatenate([[0.0], running])[starts]
+        cumulative = running - np.repeat(base, bets)
+        # Shifting each strategy above the previous one lets a single
+        # maximum.accumulate act as a per-strategy running peak.
+        shift = np.repeat(np.arange(len(masks)) * (np.abs(cumulative).max(initial=0.0) * 2 + 1), bets)
+        peak = np.maximum(np.maximum.accumulate(cumulative + shift) - shift, 0.0)
+        drawdown = peak - cumulative
+        has_bets = bets > 0
+        result['bets'][chunk] = bets
+        result['hits'][chunk] = np.bincount(rows, weights=data['won'][side_rows, positions], minlength=len(masks))
+        result['profit'][chunk] = np.where(has_bets, cumulative[np.maximum(ends - 1, 0)] if len(cumulative) else 0.0, 0.0)
+        result['max_drawdown'][chunk][has_bets] = np.maximum.reduceat(drawdown, starts[has_bets]) if len(drawdown) else []
+        if with_curves:
+            for first, last in zip(starts, ends):
+                curves.append({'dates': data['dates'][positions[first:last]], 'profit': cumulative[first:last]})
+    placed = np.maximum(result['bets'], 1)
+    result['roi'] = result['profit'] / placed * 100
+    result['hit_rate'] = result['hits'] / placed * 100
+    if with_curves:
+        result['curves'] = curves
+    return result
+
 app = dash.Dash(
     __name__,
+    compress=True,
     external_stylesheets=[
         dbc.themes.CERULEAN, 
         "https://fonts.googleapis.com/css2?family=Carter+One&family=Sonsie+One&family=Orbitron:wght@400;700;900&display=swap"
@@ -78,6 +750,298 @@ app = dash.Dash(
 
 server = app.server 
 
+figure_cache = DiskCache(
+    os.environ.get('FIGURE_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'tennis_figure_cache.sqlite')),
+    max_bytes=int(os.environ.get('FIGURE_CACHE_MAX_MB', '256')) * 1024 * 1024
+)
+
+# Filtering and aggregation for the global-filter charts go through this; the
+# SQL backends keep the matches in a file shared by every worker on the host.
+query_backend = make_backend(
+    QUERY_BACKEND, df,
+    path=os.environ.get('QUERY_DB_PATH', os.path.join(tempfile.gettempdir(), f'tennis_matches_{DATASET_VERSION}.{QUERY_BACKEND}')),
+    version=DATASET_VERSION
+)
+
+DATE_INPUT = re.compile(r'^(\d{4}-\d{2}-\d{2})(?:[T ]00:00:00)?$')
+
+SUBPLOT_TRACE_TYPES = {
+    'polar': {'scatterpolar', 'scatterpolargl', 'barpolar'},
+    'ternary': {'scatterternary'},
+    'scene': {'scatter3d', 'surface', 'mesh3d', 'cone', 'streamtube', 'isosurface', 'volume'},
+    'geo': {'scattergeo', 'choropleth'},
+    'mapbox': {'scattermapbox', 'choroplethmapbox', 'densitymapbox'}
+}
+CONTINUOUS_TRACE_TYPES = {'heatmap', 'contour', 'histogram2d', 'histogram2dcontour', 'surface'}
+
+EMPTY_FIGURE_LAYOUT = {
+    'paper_bgcolor': 'rgba(0,0,0,0)',
+    'plot_bgcolor': 'rgba(0,0,0,0.1)',
+    'font': {'color': '#ffffff'}
+}
+
+def empty_figure(title):
+    return {'layout': dict(EMPTY_FIGURE_LAYOUT, title=title)}
+
+def busy_figure():
+    return empty_figure('Server busy: change a filter to retry')
+
+# Dark neon look shared by every chart; figures only set what is specific to them.
+# It is merged onto the stock template once here, since a "plotly+..." default
+# would be re-merged on every figure construction.
+pio.templates['tennis_neon'] = pio.templates.merge_templates('plotly', go.layout.Template(
+    layout=dict(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0.1)',
+        font=dict(color='#ffffff'),
+        xaxis=dict(gridcolor='rgba(0, 255, 242, 0.1)'),
+        yaxis=dict(gridcolor='rgba(0, 255, 242, 0.1)'),
+        polar=dict(
+            bgcolor='rgba(0,0,0,0.1)',
+            radialaxis=dict(gridcolor='rgba(0, 255, 242, 0.2)', showline=False, tickfont=dict(color="#ffffff")),
+            angularaxis=dict(gridcolor='rgba(0, 255, 242, 0.2)', showline=False, tickfont=dict(color="#ffffff"))
+        )
+    )
+))
+pio.templates.default = 'tennis_neon'
+
+def compact_figure(fig):
+    # The default template weighs ~7 KB per figure, mostly trace defaults and
+    # subplot settings this figure never uses. Keep only the relevant parts and
+    # let plotly.js fill in the rest of its defaults in the browser.
+    trace_types = {trace.type for trace in fig.data}
+    template = fig.layout.template.to_plotly_json()
+    template['data'] = {k: v for k, v in template.get('data', {}).items() if k in trace_types}
+    template_layout = template.get('layout', {})
+    for subplot, types in SUBPLOT_TRACE_TYPES.items():
+        if not trace_types & types:
+            template_layout.pop(subplot, None)
+    uses_coloraxis = bool(fig.layout.coloraxis.to_plotly_json())
+    if not trace_types & CONTINUOUS_TRACE_TYPES and not (uses_coloraxis and fig.layout.coloraxis.colorscale is None):
+        template_layout.pop('colorscale', None)
+    if not uses_coloraxis:
+        template_layout.pop('coloraxis', None)
+    fig.layout.template = template
+    return fig
+
+def normalize_input(value):
+    if isinstance(value, (list, tuple)):
+        return sorted((normalize_input(v) for v in value), key=str)
+    if isinstance(value, str):
+        match = DATE_INPUT.match(value)
+        return match.group(1) if match else value
+    return value
+
+callback_flights = SingleFlight()
+callback_pool = None
+pooled_callbacks = {}
+
+def encode_result(result):
+    return json.dumps(result, cls=plotly.utils.PlotlyJSONEncoder).encode()
+
+def run_pooled(callback_id, args):
+    # Runs in a pool process, which inherited the data and the callbacks at fork;
+    # the result crosses back as the same JSON the figure cache stores.
+    return encode_result(pooled_callbacks[callback_id](*args))
+
+def parse_callback_limits(spec):
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        callback_id, limit = item.split('=')
+        concurrency, budget = limit.split('/')
+        limits[callback_id.strip()] = (threading.BoundedSemaphore(int(concurrency)), int(concurrency), float(budget))
+    return limits
+
+callback_limits = parse_callback_limits(CALLBACK_LIMITS)
+shed_lock = threading.Lock()
+shed_counts = {}
+# What a single-flight leader hands its waiters when it is shed, so each request,
+# waiters included, sheds with its own trigger and its own ETag.
+SHED = object()
+
+def shed(callback_id, placeholder):
+    # Over its queue budget: the browser keeps the figure it already shows, and
+    # only a first render, with nothing on screen yet, gets the placeholder.
+    with shed_lock:
+        shed_counts[callback_id] = shed_counts.get(callback_id, 0) + 1
+    if placeholder is None or dash.callback_context.triggered_id is not None:
+        raise dash.exceptions.PreventUpdate
+    if has_request_context():
+        g.pop('dash_etag', None)
+    return placeholder()
+
+def cached_callback(callback_id, placeholder=None):
+    def decorator(func):
+        pooled_callbacks[callback_id] = func
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = hashlib.sha256(json.dumps(
+                [callback_id, [normalize_input(a) for a in args], DATASET_VERSION, CODE_VERSION],
+                default=str
+            ).encode()).hexdigest()
+            blob = figure_cache.get(key)
+            if blob is not None:
+                return json.loads(blob)
+
+            def compute():
+                if callback_id in callback_limits:
+                    slots, _, budget = callback_limits[callback_id]
+                    if not slots.acquire(timeout=budget):
+                        return SHED
+                    try:
+                        return run()
+                    finally:
+                        slots.release()
+                return run()
+
+            def run():
+                if callback_pool is not None and callback_pool.usable():
+                    blob = callback_pool.run(run_pooled, callback_id, args)
+                    figure_cache.set(key, blob)
+                    return json.loads(blob)
+                result = func(*args)
+                figure_cache.set(key, encode_result(result))
+                return result
+            # Identical requests arriving while the first is still computing
+            # (a shared matchup link, say) wait for it instead of recomputing.
+            result = callback_flights.do(key, compute)
+            if result is SHED:
+                return shed(callback_id, placeholder)
+            return result
+        return wrapper
+    return decorator
+
+def dash_request_items(items):
+    # Callback inputs and state arrive as {id, property, value} dicts, or lists of
+    # them for wildcard ids.
+    for item in items or []:
+        if isinstance(item, list):
+            yield from dash_request_items(item)
+        else:
+            yield [item.get('id'), item.get('property'), normalize_input(item.get('value'))]
+
+def dash_request_etag():
+    # Outputs depend only on the callback, its inputs and the data/code versions,
+    # so a strong ETag can be computed from the request before running anything.
+    if request.method == 'GET' and request.path.endswith('/_dash-layout'):
+        # The layout also changes with the settings that add the cube store and
+        # the background job progress bars.
+        parts = ['layout', CLIENTSIDE_FILTERING, BACKGROUND_CALLBACKS]
+    elif request.method == 'POST' and request.path.endswith('/_dash-update-component'):
+        body = request.get_json(silent=True) or {}
+        # Background callbacks answer with a job handle and then poll for it, so
+        # neither response may be replayed.
+        if request.args or set(str(body.get('output', '')).strip('.').split('...')) & background_outputs:
+            return None
+        parts = [body.get('output'), list(dash_request_items(body.get('inputs'))), list(dash_request_items(body.get('state')))]
+    else:
+        return None
+    return hashlib.sha256(json.dumps(parts + [DATASET_VERSION, CODE_VERSION], default=str).encode()).hexdigest()[:32]
+
+def not_modified_etag(etag):
+    # flask-compress tags compressed bodies as "<etag>:gzip" etc., so clients send
+    # those back; any representation of the same content is still fresh.
+    for suffix in ['', ':gzip', ':br', ':deflate', ':zstd']:
+        if request.if_none_match.contains(etag + suffix):
+            return etag + suffix
+    return None
+
+def set_http_cache_headers(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={HTTP_CACHE_MAX_AGE}'
+    return response
+
+SERVED_ETAGS_MAX = 10000
+served_etags = set()
+
+def remember_served_etag(etag):
+    # ETags this worker has answered with a 200. Only these let a conditional
+    # request be answered before it runs, so a wildcard or a guessed ETag on a
+    # bad request still gets its error.
+    if len(served_etags) >= SERVED_ETAGS_MAX:
+        served_etags.clear()
+    served_etags.add(etag)
+
+def not_modified_response(matched):
+    # A matching If-None-Match on anything but a GET is a failed precondition.
+    status = 304 if request.method in ('GET', 'HEAD') else 412
+    return set_http_cache_headers(Response(status=status), matched)
+
+@server.before_request
+def answer_not_modified():
+    etag = dash_request_etag()
+    if etag is None:
+        return None
+    g.dash_etag = etag
+    matched = not_modified_etag(etag)
+    if matched is not None and etag in served_etags:
+        return not_modified_response(matched)
+    return None
+
+@server.after_request
+def tag_dash_response(response):
+    etag = g.get('dash_etag')
+    if etag is not None and response.status_code == 200:
+        remember_served_etag(etag)
+        matched = not_modified_etag(etag)
+        if matched is not None:
+            return not_modified_response(matched)
+        set_http_cache_headers(response, etag)
+    return response
+
+# With BACKGROUND_CALLBACKS=1 the heavy callbacks run as Dash background jobs in
+# a separate process, queued through a local diskcache, so a long sunburst or
+# backtest never holds a request worker.
+if BACKGROUND_CALLBACKS:
+    import diskcache
+    background_manager = dash.DiskcacheManager(diskcache.Cache(
+        os.environ.get('BACKGROUND_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'tennis_background_jobs'))
+    ))
+else:
+    background_manager = None
+background_outputs = set()
+job_progress_local = threading.local()
+
+JOB_PROGRESS_STYLE = {'width': '100%', 'height': '4px', 'accentColor': '#00fff2'}
+
+def job_progress(component_id):
+    # Only shown while its callback runs as a background job.
+    return html.Progress(id=component_id, value='0', max='1', style=dict(JOB_PROGRESS_STYLE, display='none'))
+
+def report_progress(done, total):
+    set_progress = getattr(job_progress_local, 'set_progress', None)
+    if set_progress is not None:
+        set_progress((str(done), str(total)))
+
+def heavy_callback(outputs, inputs, progress_id):
+    def decorator(func):
+        if background_manager is None:
+            app.callback(outputs, inputs)(func)
+            return func
+
+        @functools.wraps(func)
+        def job(set_progress, *args):
+            job_progress_local.set_progress = set_progress
+            try:
+                return func(*args)
+            finally:
+                job_progress_local.set_progress = None
+
+        background_outputs.update(str(o) for o in (outputs if isinstance(outputs, list) else [outputs]))
+        # A job still running when its inputs change is terminated: the renderer
+        # sends its id as oldJob with the next request.
+        app.callback(
+            outputs, inputs,
+            background=True,
+            manager=background_manager,
+            interval=500,
+            progress=[Output(progress_id, 'value'), Output(progress_id, 'max')],
+            running=[(Output(progress_id, 'style'), JOB_PROGRESS_STYLE, dict(JOB_PROGRESS_STYLE, display='none'))]
+        )(job)
+        return func
+    return decorator
+
 app.index_string = '''
 <!DOCTYPE html>
 <html>
@@ -280,865 +1244,1177 @@ app.index_string = '''
 </html>
 '''
 
-app.layout = html.Div(
+SECTION_TABS = [
+    ("🧠 TOURNAMENT WINS", 'overview'),
+    ("⚖️ ODDS & BETTING", 'odds'),
+    ("👤 PLAYER", 'player'),
+    ("⚔️ HEAD-TO-HEAD", 'h2h')
+]
+
+SECTION_TAB_STYLE = {
+    'background': 'rgba(15, 23, 42, 0.7)',
+    'color': '#94a3b8',
+    'border': '1px solid rgba(0, 255, 242, 0.2)',
+    'fontFamily': '"Orbitron", sans-serif',
+    'fontSize': '13px',
+    'fontWeight': '700',
+    'letterSpacing': '2px',
+    'padding': '14px'
+}
+EXPORT_LINK_STYLE = {
+    'color': '#00fff2',
+    'fontFamily': '"Orbitron", sans-serif',
+    'fontSize': '12px',
+    'fontWeight': '700',
+    'letterSpacing': '2px',
+    'textDecoration': 'none',
+    'marginLeft': '24px'
+}
+
+def export_links(prefix):
+    # Download the matches behind the current selection; hrefs are set clientside.
+    return html.Div(
+        style={'textAlign': 'right', 'marginTop': '20px'},
+        children=[
+            html.A("⬇ CSV", id=f'{prefix}-csv', href='', style=EXPORT_LINK_STYLE),
+            html.A("⬇ PARQUET", id=f'{prefix}-parquet', href='', style=EXPORT_LINK_STYLE)
+        ]
+    )
+
+SECTION_TAB_SELECTED_STYLE = dict(
+    SECTION_TAB_STYLE,
+    color='#00fff2',
+    background='rgba(0, 255, 242, 0.08)',
+    borderTop='2px solid #00fff2',
+    textShadow='0 0 10px rgba(0, 255, 242, 0.5)'
+)
+
+
+overview_section = html.Div(
     style={
-        'background': 'linear-gradient(135deg, #0a0e27 0%, #1a1a2e 50%, #16213e 100%)',
-        'minHeight': '100vh',
+        'background': 'rgba(15, 23, 42, 0.7)',
+        'backdropFilter': 'blur(10px)',
+        'borderRadius': '24px',
+        'padding': '40px',
+        'boxShadow': '0 0 40px rgba(0, 255, 242, 0.15), inset 0 0 60px rgba(0, 255, 242, 0.03)',
+        'border': '2px solid rgba(0, 255, 242, 0.2)',
+        'marginBottom': '60px',
         'position': 'relative',
         'overflow': 'hidden'
     },
     children=[
-    html.Div(
-        style={
-            'position': 'fixed',
-            'top': '0',
-            'left': '0',
-            'right': '0',
-            'bottom': '0',
-            'background': 'radial-gradient(circle at 20% 50%, rgba(0, 255, 242, 0.05) 0%, transparent 50%), radial-gradient(circle at 80% 50%, rgba(102, 126, 234, 0.05) 0%, transparent 50%)',
-            'zIndex': '0',
-            'pointerEvents': 'none'
-        }
-    ),
-    
-    html.Header(
-        style={
-            'background': 'linear-gradient(135deg, #0f0c29 0%, #302b63 50%, #24243e 100%)',
-            'padding': '25px 40px',
-            'display': 'flex',
-            'alignItems': 'center',
-            'justifyContent': 'space-between',
-            'boxShadow': '0 10px 40px rgba(0, 255, 242, 0.3), 0 0 80px rgba(48, 43, 99, 0.5)',
-            'borderBottom': '3px solid #00fff2',
-            'position': 'relative',
-            'overflow': 'hidden',
-            'zIndex': '10'
-        },
-        children=[
-            html.Div(
-                style={
-                    'position': 'absolute',
-                    'top': '0',
-                    'left': '0',
-                    'right': '0',
-                    'bottom': '0',
-                    'background': 'linear-gradient(90deg, transparent, rgba(0, 255, 242, 0.1), transparent)',
-                    'animation': 'slideIn 3s infinite alternate',
-                    'zIndex': '0'
-                }
-            ),
-            
-            html.Div(
-                style={
-                    'display': 'flex',
-                    'alignItems': 'center',
-                    'gap': '25px',
-                    'zIndex': '1'
-                },
-                children=[
-                    html.Img(
-                        src="assets/atp_logo.png",
-                        style={
-                            'height': '60px',
-                            'width': 'auto',
-                            'filter': 'drop-shadow(0 0 15px rgba(0, 255, 242, 0.6))',
-                            'animation': 'slideIn 1s ease-out'
-                        }
-                    ),
-                    
-                    html.H1(
-                        "PROFESSIONAL MEN TENNIS ANALYTICS",
-                        style={
-                            'color': '#00fff2',
-                            'margin': '0',
-                            'fontSize': '38px',
-                            'fontWeight': '900',
-                            'fontFamily': '"Orbitron", sans-serif',
-                            'letterSpacing': '4px',
-                            'textTransform': 'uppercase',
-                            'animation': 'slideIn 1.2s ease-out',
-                            'background': 'linear-gradient(90deg, #00fff2, #00d4ff, #00fff2)',
-                            'backgroundClip': 'text',
-                            'WebkitBackgroundClip': 'text',
-                            'WebkitTextFillColor': 'transparent',
-                            'lineHeight': '1.2'
-                        }
-                    ),
-                ]
-            ),
-            
-            html.A(
-                href="https://www.kaggle.com/datasets/dissfya/atp-tennis-2000-2023daily-pull",
-                target="_blank",
-                className="source-icon",
-                style={
-                    'display': 'flex',
-                    'alignItems': 'center',
-                    'gap': '12px',
-                    'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
-                    'padding': '12px 24px',
-                    'borderRadius': '50px',
-                    'textDecoration': 'none',
-                    'boxShadow': '0 8px 20px rgba(102, 126, 234, 0.4)',
-                    'border': '2px solid #00fff2',
-                    'zIndex': '1'
-                },
-                children=[
-                    html.Span(
-                        "📊",
-                        style={'fontSize': '24px'}
-                    ),
-                    html.Span(
-                        "DATA SOURCE",
-                        style={
-                            'color': 'white',
-                            'fontFamily': '"Orbitron", sans-serif',
-                            'fontWeight': 'bold',
-                            'fontSize': '14px',
-                            'letterSpacing': '2px'
-                        }
-                    )
-                ]
-            )
-        ]
-    ),
-
-    html.Div(
-        style={
-            'maxWidth': '1600px',
-            'margin': '0 auto',
-            'padding': '60px 40px 80px 40px',
-            'position': 'relative',
-            'zIndex': '1'
-        },
-        children=[
-            
-            html.Div(
-                style={
-                    'background': 'rgba(15, 23, 42, 0.7)',
-                    'backdropFilter': 'blur(10px)',
-                    'borderRadius': '24px',
-                    'padding': '40px',
-                    'boxShadow': '0 0 40px rgba(0, 255, 242, 0.15), inset 0 0 60px rgba(0, 255, 242, 0.03)',
-                    'border': '2px solid rgba(0, 255, 242, 0.2)',
-                    'marginBottom': '60px',
-                    'position': 'relative',
-                    'overflow': 'hidden'
-                },
-                children=[
-                    html.Div(
-                        className="cyber-title",
-                        style={
-                            'textAlign': 'center',
-                            'marginBottom': '40px',
-                            'position': 'relative',
-                            'zIndex': '1'
-                        },
-                        children=[
-                            html.H2(
-                                "Overall Tournament Wins Breakdown 🧠",
+        html.Div(
+            className="cyber-title",
+            style={
+                'textAlign': 'center',
+                'marginBottom': '40px',
+                'position': 'relative',
+                'zIndex': '1'
+            },
+            children=[
+                html.H2(
+                    "Overall Tournament Wins Breakdown 🧠",
+                    style={
+                        'fontSize': '28px',
+                        'fontWeight': '900',
+                        'color': '#00fff2',
+                        'fontFamily': '"Orbitron", sans-serif',
+                        'letterSpacing': '3px',
+                        'textTransform': 'uppercase',
+                        'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
+                        'margin': '0'
+                    }
+                )
+            ]
+        ),
+        html.Div(
+            style={
+                'background': 'rgba(0, 255, 242, 0.05)',
+                'borderRadius': '20px',
+                'padding': '30px',
+                'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
+                'border': '1px solid rgba(0, 255, 242, 0.2)',
+                'position': 'relative',
+                'zIndex': '1',
+                'marginBottom': '40px' 
+            },
+            children=[
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': 'repeat(auto-fit, minmax(200px, 1fr))', 
+                        'gap': '20px'
+                    },
+                    children=[
+                        html.Div([
+                            html.Label(
+                                "🎾 SURFACE",
                                 style={
-                                    'fontSize': '28px',
-                                    'fontWeight': '900',
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
                                     'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
                                     'fontFamily': '"Orbitron", sans-serif',
-                                    'letterSpacing': '3px',
-                                    'textTransform': 'uppercase',
-                                    'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
-                                    'margin': '0'
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
                                 }
-                            )
-                        ]
-                    ),
-                    html.Div(
-                        style={
-                            'background': 'rgba(0, 255, 242, 0.05)',
-                            'borderRadius': '20px',
-                            'padding': '30px',
-                            'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
-                            'border': '1px solid rgba(0, 255, 242, 0.2)',
-                            'position': 'relative',
-                            'zIndex': '1',
-                            'marginBottom': '40px' 
-                        },
-                        children=[
-                            html.Div(
+                            ),
+                            dcc.Dropdown(
+                                id='surface-slicer',
+                                persistence=True,
+                                persistence_type='session',
+                                options=[{'label': f"🏟️ {i}", 'value': i} for i in df['Surface'].unique()],
+                                value=df['Surface'].unique().tolist(),
+                                multi=True,
+                                placeholder="Choose surfaces...",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]),
+                        html.Div([
+                            html.Label(
+                                "🏆 SERIES",
                                 style={
-                                    'display': 'grid',
-                                    'gridTemplateColumns': 'repeat(auto-fit, minmax(200px, 1fr))', 
-                                    'gap': '20px'
-                                },
-                                children=[
-                                    html.Div([
-                                        html.Label(
-                                            "🎾 SURFACE",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.Dropdown(
-                                            id='surface-slicer',
-                                            options=[{'label': f"🏟️ {i}", 'value': i} for i in df['Surface'].unique()],
-                                            value=df['Surface'].unique().tolist(),
-                                            multi=True,
-                                            placeholder="Choose surfaces...",
-                                            style={'fontSize': '14px', 'fontWeight': '500'}
-                                        ),
-                                    ]),
-                                    html.Div([
-                                        html.Label(
-                                            "🏆 SERIES",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.Dropdown(
-                                            id='series-slicer',
-                                            options=[{'label': f"🎪 {i}", 'value': i} for i in df['Series'].unique()],
-                                            value=['International'],
-                                            multi=True,
-                                            placeholder="Choose series...",
-                                            style={'fontSize': '14px', 'fontWeight': '500'}
-                                        ),
-                                    ]),
-                                    html.Div([
-                                        html.Label(
-                                            "🏟️ COURT",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.Dropdown(
-                                            id='court-slicer',
-                                            options=[{'label': f"📍 {i}", 'value': i} for i in df['Court'].unique()],
-                                            value=df['Court'].unique().tolist(),
-                                            multi=True,
-                                            placeholder="Choose court types...",
-                                            style={'fontSize': '14px', 'fontWeight': '500'}
-                                        ),
-                                    ]),
-                                    html.Div([
-                                        html.Label(
-                                            "📅 DATE RANGE",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.DatePickerRange(
-                                            id='date-range-slicer',
-                                            min_date_allowed=df['Date'].min(),
-                                            max_date_allowed=df['Date'].max(),
-                                            start_date=df['Date'].min(),
-                                            end_date=df['Date'].max(),
-                                            display_format='DD/MM/YYYY',
-                                            start_date_placeholder_text="Start",
-                                            end_date_placeholder_text="End",
-                                            style={'width': '100%'}
-                                        )
-                                    ]),
-                                ]
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
+                                    'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                                }
                             ),
-                        ]
-                    ),
-                    
-                    html.Div(
-                        style={
-                            'display': 'grid',
-                            'gridTemplateColumns': '2fr 1fr', 
-                            'gap': '40px',
-                        },
-                        children=[
-                            html.Div(
+                            dcc.Dropdown(
+                                id='series-slicer',
+                                persistence=True,
+                                persistence_type='session',
+                                options=[{'label': f"🎪 {i}", 'value': i} for i in df['Series'].unique()],
+                                value=['International'],
+                                multi=True,
+                                placeholder="Choose series...",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]),
+                        html.Div([
+                            html.Label(
+                                "🏟️ COURT",
                                 style={
-                                    'background': 'rgba(0, 255, 242, 0.03)',
-                                    'borderRadius': '16px',
-                                    'padding': '25px',
-                                    'border': '1px solid rgba(0, 255, 242, 0.15)',
-                                    'position': 'relative'
-                                },
-                                children=[
-                                    html.Div(
-                                        className="cyber-title",
-                                        style={
-                                            'textAlign': 'center',
-                                            'marginBottom': '40px',
-                                            'position': 'relative',
-                                            'zIndex': '1'
-                                        },
-                                        children=[
-                                            html.H2(
-                                                "Series Kings 👑",
-                                                style={
-                                                    'fontSize': '28px',
-                                                    'fontWeight': '900',
-                                                    'color': '#00fff2',
-                                                    'fontFamily': '"Orbitron", sans-serif',
-                                                    'letterSpacing': '3px',
-                                                    'textTransform': 'uppercase',
-                                                    'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
-                                                    'margin': '0'
-                                                }
-                                            )
-                                        ]
-                                    ),
-                                    html.Div(
-                                        style={'position': 'relative', 'zIndex': '1'},
-                                        children=[dcc.Graph(id='wins-treemap')] 
-                                    )
-                                ]
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
+                                    'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                                }
                             ),
-                            
-                            html.Div(
+                            dcc.Dropdown(
+                                id='court-slicer',
+                                persistence=True,
+                                persistence_type='session',
+                                options=[{'label': f"📍 {i}", 'value': i} for i in df['Court'].unique()],
+                                value=df['Court'].unique().tolist(),
+                                multi=True,
+                                placeholder="Choose court types...",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]),
+                        html.Div([
+                            html.Label(
+                                "📅 DATE RANGE",
                                 style={
-                                    'background': 'rgba(0, 255, 242, 0.03)',
-                                    'borderRadius': '16px',
-                                    'padding': '25px',
-                                    'border': '1px solid rgba(0, 255, 242, 0.15)',
-                                    'position': 'relative'
-                                },
-                                children=[
-                                    html.Div(
-                                        className="cyber-title",
-                                        style={
-                                            'textAlign': 'center',
-                                            'marginBottom': '40px',
-                                            'position': 'relative',
-                                            'zIndex': '1'
-                                        },
-                                        children=[
-                                            html.H2(
-                                                "PATH TO VICTORY 🏆",
-                                                style={
-                                                    'fontSize': '24px',
-                                                    'fontWeight': '900',
-                                                    'color': '#00fff2',
-                                                    'fontFamily': '"Orbitron", sans-serif',
-                                                    'letterSpacing': '3px',
-                                                    'textTransform': 'uppercase',
-                                                    'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
-                                                    'margin': '0'
-                                                }
-                                            )
-                                        ]
-                                    ),
-                                    html.Div(
-                                        style={'position': 'relative', 'zIndex': '1'},
-                                        children=[dcc.Graph(id='sunburst-chart')]
-                                    )
-                                ]
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
+                                    'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                                }
                             ),
-                        ]
-                    ),
-                ]
-            ),
-            
-            html.Div(
-                style={
-                    'background': 'rgba(15, 23, 42, 0.7)',
-                    'backdropFilter': 'blur(10px)',
-                    'borderRadius': '24px',
-                    'padding': '40px',
-                    'boxShadow': '0 0 40px rgba(0, 255, 242, 0.15), inset 0 0 60px rgba(0, 255, 242, 0.03)',
-                    'border': '2px solid rgba(0, 255, 242, 0.2)',
-                    'marginBottom': '60px',
-                    'position': 'relative',
-                    'overflow': 'hidden'
-                },
-                children=[
-                    html.Div(
-                        className="cyber-title",
-                        style={
-                            'textAlign': 'center',
-                            'marginBottom': '40px'
-                        },
-                        children=[
-                            html.H2(
-                                "QUALITY GAP: FAVORITES VS UNDERDOGS ⚖️",
+                            dcc.DatePickerRange(
+                                id='date-range-slicer',
+                                persistence=True,
+                                persistence_type='session',
+                                min_date_allowed=df['Date'].min(),
+                                max_date_allowed=df['Date'].max(),
+                                start_date=df['Date'].min(),
+                                end_date=df['Date'].max(),
+                                display_format='DD/MM/YYYY',
+                                start_date_placeholder_text="Start",
+                                end_date_placeholder_text="End",
+                                style={'width': '100%'}
+                            )
+                        ]),
+                    ]
+                ),
+                export_links('matches-export')
+            ]
+        ),
+
+        html.Div(
+            style={
+                'display': 'grid',
+                'gridTemplateColumns': '2fr 1fr', 
+                'gap': '40px',
+            },
+            children=[
+                html.Div(
+                    style={
+                        'background': 'rgba(0, 255, 242, 0.03)',
+                        'borderRadius': '16px',
+                        'padding': '25px',
+                        'border': '1px solid rgba(0, 255, 242, 0.15)',
+                        'position': 'relative'
+                    },
+                    children=[
+                        html.Div(
+                            className="cyber-title",
+                            style={
+                                'textAlign': 'center',
+                                'marginBottom': '40px',
+                                'position': 'relative',
+                                'zIndex': '1'
+                            },
+                            children=[
+                                html.H2(
+                                    "Series Kings 👑",
+                                    style={
+                                        'fontSize': '28px',
+                                        'fontWeight': '900',
+                                        'color': '#00fff2',
+                                        'fontFamily': '"Orbitron", sans-serif',
+                                        'letterSpacing': '3px',
+                                        'textTransform': 'uppercase',
+                                        'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
+                                        'margin': '0'
+                                    }
+                                )
+                            ]
+                        ),
+                        html.Div(
+                            style={'position': 'relative', 'zIndex': '1'},
+                            children=[dcc.Graph(id='wins-treemap')] 
+                        )
+                    ]
+                ),
+
+                html.Div(
+                    style={
+                        'background': 'rgba(0, 255, 242, 0.03)',
+                        'borderRadius': '16px',
+                        'padding': '25px',
+                        'border': '1px solid rgba(0, 255, 242, 0.15)',
+                        'position': 'relative'
+                    },
+                    children=[
+                        html.Div(
+                            className="cyber-title",
+                            style={
+                                'textAlign': 'center',
+                                'marginBottom': '40px',
+                                'position': 'relative',
+                                'zIndex': '1'
+                            },
+                            children=[
+                                html.H2(
+                                    "PATH TO VICTORY 🏆",
+                                    style={
+                                        'fontSize': '24px',
+                                        'fontWeight': '900',
+                                        'color': '#00fff2',
+                                        'fontFamily': '"Orbitron", sans-serif',
+                                        'letterSpacing': '3px',
+                                        'textTransform': 'uppercase',
+                                        'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
+                                        'margin': '0'
+                                    }
+                                )
+                            ]
+                        ),
+                        html.Div(
+                            style={'position': 'relative', 'zIndex': '1'},
+                            children=[job_progress('sunburst-progress'), dcc.Graph(id='sunburst-chart')]
+                        )
+                    ]
+                ),
+            ]
+        ),
+    ]
+)
+
+
+odds_section = html.Div(
+    style={
+        'background': 'rgba(15, 23, 42, 0.7)',
+        'backdropFilter': 'blur(10px)',
+        'borderRadius': '24px',
+        'padding': '40px',
+        'boxShadow': '0 0 40px rgba(0, 255, 242, 0.15), inset 0 0 60px rgba(0, 255, 242, 0.03)',
+        'border': '2px solid rgba(0, 255, 242, 0.2)',
+        'marginBottom': '60px',
+        'position': 'relative',
+        'overflow': 'hidden'
+    },
+    children=[
+        html.Div(
+            className="cyber-title",
+            style={
+                'textAlign': 'center',
+                'marginBottom': '40px'
+            },
+            children=[
+                html.H2(
+                    "QUALITY GAP: FAVORITES VS UNDERDOGS ⚖️",
+                    style={
+                        'fontSize': '28px',
+                        'fontWeight': '900',
+                        'color': '#00fff2',
+                        'fontFamily': '"Orbitron", sans-serif',
+                        'letterSpacing': '3px',
+                        'textTransform': 'uppercase',
+                        'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
+                        'margin': '0'
+                    }
+                )
+            ]
+        ),
+
+        html.Div(
+            style={
+                'background': 'rgba(0, 255, 242, 0.05)',
+                'borderRadius': '20px',
+                'padding': '30px',
+                'marginBottom': '35px',
+                'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
+                'border': '1px solid rgba(0, 255, 242, 0.2)'
+            },
+            children=[
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))',
+                        'gap': '20px'
+                    },
+                    children=[
+                        html.Div([
+                            html.Label(
+                                "📊 VISUALIZATION CATEGORY",
                                 style={
-                                    'fontSize': '28px',
-                                    'fontWeight': '900',
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
                                     'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
                                     'fontFamily': '"Orbitron", sans-serif',
-                                    'letterSpacing': '3px',
-                                    'textTransform': 'uppercase',
-                                    'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
-                                    'margin': '0'
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
                                 }
-                            )
-                        ]
-                    ),
-                    
-                    html.Div(
-                        style={
-                            'background': 'rgba(0, 255, 242, 0.05)',
-                            'borderRadius': '20px',
-                            'padding': '30px',
-                            'marginBottom': '35px',
-                            'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
-                            'border': '1px solid rgba(0, 255, 242, 0.2)'
-                        },
-                        children=[
-                            html.Div(
+                            ),
+                            dcc.Dropdown(
+                                id='category-selector',
+                                persistence=True,
+                                persistence_type='session',
+                                options=[
+                                    {'label': '🏟️ Surface', 'value': 'Surface'},
+                                    {'label': '🏆 Series', 'value': 'Series'}
+                                ],
+                                value='Series',
+                                clearable=False,
+                                placeholder="Choose category...",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]),
+                    ]
+                )
+            ]
+        ),
+
+        dcc.Graph(id='odds-box-plot'),
+        dcc.Graph(id='calibration-chart', style={'marginTop': '30px'}),
+
+        html.Div(
+            className="cyber-title",
+            style={
+                'textAlign': 'center',
+                'margin': '50px 0 40px 0'
+            },
+            children=[
+                html.H2(
+                    "STRATEGY BACKTEST 📈",
+                    style={
+                        'fontSize': '24px',
+                        'fontWeight': '900',
+                        'color': '#00fff2',
+                        'fontFamily': '"Orbitron", sans-serif',
+                        'letterSpacing': '3px',
+                        'textTransform': 'uppercase',
+                        'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
+                        'margin': '0'
+                    }
+                )
+            ]
+        ),
+
+        html.Div(
+            style={
+                'background': 'rgba(0, 255, 242, 0.05)',
+                'borderRadius': '20px',
+                'padding': '30px',
+                'marginBottom': '35px',
+                'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
+                'border': '1px solid rgba(0, 255, 242, 0.2)'
+            },
+            children=[
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': 'repeat(auto-fit, minmax(220px, 1fr))',
+                        'gap': '20px'
+                    },
+                    children=[
+                        html.Div([
+                            html.Label(
+                                label,
                                 style={
-                                    'display': 'grid',
-                                    'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))',
-                                    'gap': '20px'
-                                },
-                                children=[
-                                    html.Div([
-                                        html.Label(
-                                            "📊 VISUALIZATION CATEGORY",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.Dropdown(
-                                            id='category-selector',
-                                            options=[
-                                                {'label': '🏟️ Surface', 'value': 'Surface'},
-                                                {'label': '🏆 Series', 'value': 'Series'}
-                                            ],
-                                            value='Series',
-                                            clearable=False,
-                                            placeholder="Choose category...",
-                                            style={'fontSize': '14px', 'fontWeight': '500'}
-                                        ),
-                                    ]),
-                                ]
-                            )
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
+                                    'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                                }
+                            ),
+                            dcc.Dropdown(
+                                id=component_id,
+                                persistence=True,
+                                persistence_type='session',
+                                options=[{'label': value, 'value': value} for value in values],
+                                value=[],
+                                multi=True,
+                                placeholder="All",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]) for label, component_id, values in [
+                            ("🏟️ SURFACE", 'backtest-surface', backtest_data['surfaces']),
+                            ("🏆 SERIES", 'backtest-series', backtest_data['series_labels']),
+                            ("🎯 ROUND", 'backtest-round', backtest_data['rounds'])
                         ]
-                    ),
-                    
-                    dcc.Graph(id='odds-box-plot')
-                ]
-            ),
+                    ] + [
+                        html.Div([
+                            html.Label(
+                                "💰 ODDS OF THE BACKED SIDE",
+                                style={
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
+                                    'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                                }
+                            ),
+                            dcc.RangeSlider(
+                                id='backtest-odds',
+                                persistence=True,
+                                persistence_type='session',
+                                min=1, max=10, step=0.1,
+                                value=[1, 10],
+                                marks={i: {'label': str(i), 'style': {'color': '#00fff2'}} for i in range(1, 11)}
+                            ),
+                        ]),
+                    ]
+                )
+            ]
+        ),
 
-            html.Div(
-                style={
-                    'background': 'rgba(15, 23, 42, 0.7)',
-                    'backdropFilter': 'blur(10px)',
-                    'borderRadius': '24px',
-                    'padding': '40px',
-                    'boxShadow': '0 0 40px rgba(0, 255, 242, 0.15), inset 0 0 60px rgba(0, 255, 242, 0.03)',
-                    'border': '2px solid rgba(0, 255, 242, 0.2)',
-                    'marginBottom': '60px',
-                    'position': 'relative',
-                    'overflow': 'hidden'
-                },
-                children=[
-                    html.Div(
-                        className="cyber-title",
-                        style={
-                            'textAlign': 'center',
-                            'marginBottom': '40px'
-                        },
-                        children=[
-                            html.H2(
-                                "INDIVIDUAL PLAYER PERFORMANCE 👤",
+        job_progress('backtest-progress'),
+        dcc.Graph(id='backtest-chart'),
+        html.Div(id='backtest-leaderboard', style={'marginTop': '30px'})
+    ]
+)
+
+
+player_section = html.Div(
+    style={
+        'background': 'rgba(15, 23, 42, 0.7)',
+        'backdropFilter': 'blur(10px)',
+        'borderRadius': '24px',
+        'padding': '40px',
+        'boxShadow': '0 0 40px rgba(0, 255, 242, 0.15), inset 0 0 60px rgba(0, 255, 242, 0.03)',
+        'border': '2px solid rgba(0, 255, 242, 0.2)',
+        'marginBottom': '60px',
+        'position': 'relative',
+        'overflow': 'hidden'
+    },
+    children=[
+        html.Div(
+            className="cyber-title",
+            style={
+                'textAlign': 'center',
+                'marginBottom': '40px'
+            },
+            children=[
+                html.H2(
+                    "INDIVIDUAL PLAYER PERFORMANCE 👤",
+                    style={
+                        'fontSize': '28px',
+                        'fontWeight': '900',
+                        'color': '#00fff2',
+                        'fontFamily': '"Orbitron", sans-serif',
+                        'letterSpacing': '3px',
+                        'textTransform': 'uppercase',
+                        'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
+                        'margin': '0'
+                    }
+                )
+            ]
+        ),
+
+        html.Div(
+            style={
+                'background': 'rgba(0, 255, 242, 0.05)',
+                'borderRadius': '20px',
+                'padding': '30px',
+                'marginBottom': '35px',
+                'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
+                'border': '1px solid rgba(0, 255, 242, 0.2)'
+            },
+            children=[
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))',
+                        'gap': '20px'
+                    },
+                    children=[
+                        html.Div([
+                            html.Label(
+                                "👨‍🎾 SELECT PLAYER",
                                 style={
-                                    'fontSize': '28px',
-                                    'fontWeight': '900',
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
                                     'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
                                     'fontFamily': '"Orbitron", sans-serif',
-                                    'letterSpacing': '3px',
-                                    'textTransform': 'uppercase',
-                                    'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
-                                    'margin': '0'
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
                                 }
-                            )
-                        ]
-                    ),
-                    
-                    html.Div(
-                        style={
-                            'background': 'rgba(0, 255, 242, 0.05)',
-                            'borderRadius': '20px',
-                            'padding': '30px',
-                            'marginBottom': '35px',
-                            'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
-                            'border': '1px solid rgba(0, 255, 242, 0.2)'
-                        },
-                        children=[
-                            html.Div(
+                            ),
+                            dcc.Dropdown(
+                                id='player-slicer',
+                                persistence=True,
+                                persistence_type='session',
+                                options=player_options,
+                                value='Nadal R.',
+                                placeholder="Choose a player...",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]),
+                        html.Div([
+                            html.Label(
+                                "📆 SELECT YEAR",
                                 style={
-                                    'display': 'grid',
-                                    'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))',
-                                    'gap': '20px'
-                                },
-                                children=[
-                                    html.Div([
-                                        html.Label(
-                                            "👨‍🎾 SELECT PLAYER",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.Dropdown(
-                                            id='player-slicer',
-                                            options=player_options,
-                                            value='Nadal R.',
-                                            placeholder="Choose a player...",
-                                            style={'fontSize': '14px', 'fontWeight': '500'}
-                                        ),
-                                    ]),
-                                    html.Div([
-                                        html.Label(
-                                            "📆 SELECT YEAR",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.Dropdown(
-                                            id='year-slicer',
-                                            options=year_options,
-                                            value=2015,
-                                            placeholder="Choose a year...",
-                                            style={'fontSize': '14px', 'fontWeight': '500'}
-                                        ),
-                                    ]),
-                                ]
-                            )
-                        ]
-                    ),
-                    
-                    html.Div(id='player-kpi-row', style={'marginBottom': '40px'}),
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
+                                    'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                                }
+                            ),
+                            dcc.Dropdown(
+                                id='year-slicer',
+                                persistence=True,
+                                persistence_type='session',
+                                options=year_options,
+                                value=2015,
+                                placeholder="Choose a year...",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]),
+                    ]
+                )
+            ]
+        ),
 
-                    html.Div(
-                        style={
-                            'display': 'grid',
-                            'gridTemplateColumns': '2fr 1fr',
-                            'gap': '30px'
-                        },
-                        children=[
-                            html.Div(
+        html.Div(id='player-kpi-row', style={'marginBottom': '40px'}),
+
+        html.Div(
+            style={
+                'display': 'grid',
+                'gridTemplateColumns': '2fr 1fr',
+                'gap': '30px'
+            },
+            children=[
+                html.Div(
+                    style={
+                        'background': 'rgba(0, 255, 242, 0.03)',
+                        'borderRadius': '16px',
+                        'padding': '25px',
+                        'border': '1px solid rgba(0, 255, 242, 0.15)'
+                    },
+                    children=[job_progress('timeline-progress'), dcc.Graph(id='timeline-chart')]
+                ),
+                html.Div(
+                    style={
+                        'background': 'rgba(0, 255, 242, 0.03)',
+                        'borderRadius': '16px',
+                        'padding': '25px',
+                        'border': '1px solid rgba(0, 255, 242, 0.15)'
+                    },
+                    children=[dcc.Graph(id='radar-chart')]
+                ),
+            ]
+        ),
+
+        html.Div(
+            style={
+                'background': 'rgba(0, 255, 242, 0.03)',
+                'borderRadius': '16px',
+                'padding': '25px',
+                'border': '1px solid rgba(0, 255, 242, 0.15)',
+                'marginTop': '30px'
+            },
+            children=[dcc.Graph(id='elo-chart')]
+        ),
+
+        html.Div(
+            style={
+                'background': 'rgba(0, 255, 242, 0.03)',
+                'borderRadius': '16px',
+                'padding': '25px',
+                'border': '1px solid rgba(0, 255, 242, 0.15)',
+                'marginTop': '30px'
+            },
+            children=[dcc.Graph(id='career-chart')]
+        ),
+
+        html.Div(
+            style={
+                'display': 'grid',
+                'gridTemplateColumns': '2fr 1fr',
+                'gap': '30px',
+                'marginTop': '30px'
+            },
+            children=[
+                html.Div(
+                    style={
+                        'background': 'rgba(0, 255, 242, 0.03)',
+                        'borderRadius': '16px',
+                        'padding': '25px',
+                        'border': '1px solid rgba(0, 255, 242, 0.15)'
+                    },
+                    children=[dcc.Graph(id='break-points-year-chart')]
+                ),
+                html.Div(
+                    style={
+                        'background': 'rgba(0, 255, 242, 0.03)',
+                        'borderRadius': '16px',
+                        'padding': '25px',
+                        'border': '1px solid rgba(0, 255, 242, 0.15)'
+                    },
+                    children=[dcc.Graph(id='break-points-surface-chart')]
+                ),
+            ]
+        ),
+
+        html.Div(id='similar-players', style={'marginTop': '30px'}),
+
+        html.Div(
+            style={
+                'background': 'rgba(0, 255, 242, 0.03)',
+                'borderRadius': '16px',
+                'padding': '25px',
+                'border': '1px solid rgba(0, 255, 242, 0.15)',
+                'marginTop': '30px'
+            },
+            children=[
+                html.Label(
+                    "🏟️ SELECT TOURNAMENT",
+                    style={
+                        'fontWeight': '700',
+                        'fontSize': '13px',
+                        'color': '#00fff2',
+                        'marginBottom': '12px',
+                        'display': 'block',
+                        'fontFamily': '"Orbitron", sans-serif',
+                        'letterSpacing': '2px',
+                        'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                    }
+                ),
+                dcc.Dropdown(
+                    id='draw-slicer',
+                    persistence=True,
+                    persistence_type='session',
+                    options=draw_options,
+                    value=draw_options[0]['value'] if draw_options else None,
+                    placeholder="Choose a tournament...",
+                    style={'fontSize': '14px', 'fontWeight': '500', 'marginBottom': '20px'}
+                ),
+                dcc.Graph(id='draw-chart')
+            ]
+        ),
+    ]
+)
+
+
+h2h_section = html.Div(
+    style={
+        'background': 'rgba(15, 23, 42, 0.7)',
+        'backdropFilter': 'blur(10px)',
+        'borderRadius': '24px',
+        'padding': '40px',
+        'boxShadow': '0 0 40px rgba(0, 255, 242, 0.15), inset 0 0 60px rgba(0, 255, 242, 0.03)',
+        'border': '2px solid rgba(0, 255, 242, 0.2)',
+        'position': 'relative',
+        'overflow': 'hidden'
+    },
+    children=[
+        html.Div(
+            className="cyber-title",
+            style={
+                'textAlign': 'center',
+                'marginBottom': '40px'
+            },
+            children=[
+                html.H2(
+                    "HEAD-TO-HEAD COMPARISON ⚔️",
+                    style={
+                        'fontSize': '28px',
+                        'fontWeight': '900',
+                        'color': '#00fff2',
+                        'fontFamily': '"Orbitron", sans-serif',
+                        'letterSpacing': '3px',
+                        'textTransform': 'uppercase',
+                        'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
+                        'margin': '0'
+                    }
+                )
+            ]
+        ),
+
+        html.Div(
+            style={
+                'background': 'rgba(0, 255, 242, 0.05)',
+                'borderRadius': '20px',
+                'padding': '30px',
+                'marginBottom': '35px',
+                'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
+                'border': '1px solid rgba(0, 255, 242, 0.2)'
+            },
+            children=[
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))',
+                        'gap': '20px'
+                    },
+                    children=[
+                        html.Div([
+                            html.Label(
+                                "🥇 PLAYER 1",
                                 style={
-                                    'background': 'rgba(0, 255, 242, 0.03)',
-                                    'borderRadius': '16px',
-                                    'padding': '25px',
-                                    'border': '1px solid rgba(0, 255, 242, 0.15)'
-                                },
-                                children=[dcc.Graph(id='timeline-chart')]
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
+                                    'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                                }
                             ),
-                            html.Div(
+                            dcc.Dropdown(
+                                id='player1-slicer',
+                                persistence=True,
+                                persistence_type='session',
+                                options=player_options,
+                                value='Federer R.',
+                                placeholder="Choose first player...",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]),
+                        html.Div([
+                            html.Label(
+                                "🥈 PLAYER 2",
                                 style={
-                                    'background': 'rgba(0, 255, 242, 0.03)',
-                                    'borderRadius': '16px',
-                                    'padding': '25px',
-                                    'border': '1px solid rgba(0, 255, 242, 0.15)'
-                                },
-                                children=[dcc.Graph(id='radar-chart')]
+                                    'fontWeight': '700',
+                                    'fontSize': '13px',
+                                    'color': '#00fff2',
+                                    'marginBottom': '12px',
+                                    'display': 'block',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'letterSpacing': '2px',
+                                    'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
+                                }
                             ),
-                        ]
-                    ),
-                ]
-            ),
+                            dcc.Dropdown(
+                                id='player2-slicer',
+                                persistence=True,
+                                persistence_type='session',
+                                options=player_options,
+                                value='Nadal R.',
+                                placeholder="Choose second player...",
+                                style={'fontSize': '14px', 'fontWeight': '500'}
+                            ),
+                        ]),
+                    ]
+                ),
+                export_links('h2h-export')
+            ]
+        ),
+
+        html.Div(id='1v1-results'),
+    ]
+)
 
+
+# Sections are rendered on demand from the tabs, so a first visit only runs the
+# callbacks of the open section instead of every chart on the page.
+LAYOUT_SECTIONS = {
+    'overview': overview_section,
+    'odds': odds_section,
+    'player': player_section,
+    'h2h': h2h_section
+}
+
+
+app.layout = html.Div(
+    style={
+        'background': 'linear-gradient(135deg, #0a0e27 0%, #1a1a2e 50%, #16213e 100%)',
+        'minHeight': '100vh',
+        'position': 'relative',
+        'overflow': 'hidden'
+    },
+    children=[
+    # Outside the tabs, so the cube is sent once with the layout rather than with
+    # every render of the overview section.
+    filter_cube_store,
+    html.Div(
+        style={
+            'position': 'fixed',
+            'top': '0',
+            'left': '0',
+            'right': '0',
+            'bottom': '0',
+            'background': 'radial-gradient(circle at 20% 50%, rgba(0, 255, 242, 0.05) 0%, transparent 50%), radial-gradient(circle at 80% 50%, rgba(102, 126, 234, 0.05) 0%, transparent 50%)',
+            'zIndex': '0',
+            'pointerEvents': 'none'
+        }
+    ),
+    
+    html.Header(
+        style={
+            'background': 'linear-gradient(135deg, #0f0c29 0%, #302b63 50%, #24243e 100%)',
+            'padding': '25px 40px',
+            'display': 'flex',
+            'alignItems': 'center',
+            'justifyContent': 'space-between',
+            'boxShadow': '0 10px 40px rgba(0, 255, 242, 0.3), 0 0 80px rgba(48, 43, 99, 0.5)',
+            'borderBottom': '3px solid #00fff2',
+            'position': 'relative',
+            'overflow': 'hidden',
+            'zIndex': '10'
+        },
+        children=[
             html.Div(
                 style={
-                    'background': 'rgba(15, 23, 42, 0.7)',
-                    'backdropFilter': 'blur(10px)',
-                    'borderRadius': '24px',
-                    'padding': '40px',
-                    'boxShadow': '0 0 40px rgba(0, 255, 242, 0.15), inset 0 0 60px rgba(0, 255, 242, 0.03)',
-                    'border': '2px solid rgba(0, 255, 242, 0.2)',
-                    'position': 'relative',
-                    'overflow': 'hidden'
+                    'position': 'absolute',
+                    'top': '0',
+                    'left': '0',
+                    'right': '0',
+                    'bottom': '0',
+                    'background': 'linear-gradient(90deg, transparent, rgba(0, 255, 242, 0.1), transparent)',
+                    'animation': 'slideIn 3s infinite alternate',
+                    'zIndex': '0'
+                }
+            ),
+            
+            html.Div(
+                style={
+                    'display': 'flex',
+                    'alignItems': 'center',
+                    'gap': '25px',
+                    'zIndex': '1'
                 },
                 children=[
-                    html.Div(
-                        className="cyber-title",
+                    html.Img(
+                        src="assets/atp_logo.png",
                         style={
-                            'textAlign': 'center',
-                            'marginBottom': '40px'
-                        },
-                        children=[
-                            html.H2(
-                                "HEAD-TO-HEAD COMPARISON ⚔️",
-                                style={
-                                    'fontSize': '28px',
-                                    'fontWeight': '900',
-                                    'color': '#00fff2',
-                                    'fontFamily': '"Orbitron", sans-serif',
-                                    'letterSpacing': '3px',
-                                    'textTransform': 'uppercase',
-                                    'textShadow': '0 0 20px rgba(0, 255, 242, 0.5)',
-                                    'margin': '0'
-                                }
-                            )
-                        ]
+                            'height': '60px',
+                            'width': 'auto',
+                            'filter': 'drop-shadow(0 0 15px rgba(0, 255, 242, 0.6))',
+                            'animation': 'slideIn 1s ease-out'
+                        }
                     ),
                     
-                    html.Div(
+                    html.H1(
+                        "PROFESSIONAL MEN TENNIS ANALYTICS",
                         style={
-                            'background': 'rgba(0, 255, 242, 0.05)',
-                            'borderRadius': '20px',
-                            'padding': '30px',
-                            'marginBottom': '35px',
-                            'boxShadow': 'inset 0 0 30px rgba(0, 255, 242, 0.1)',
-                            'border': '1px solid rgba(0, 255, 242, 0.2)'
-                        },
-                        children=[
-                            html.Div(
-                                style={
-                                    'display': 'grid',
-                                    'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))',
-                                    'gap': '20px'
-                                },
-                                children=[
-                                    html.Div([
-                                        html.Label(
-                                            "🥇 PLAYER 1",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.Dropdown(
-                                            id='player1-slicer',
-                                            options=player_options,
-                                            value='Federer R.',
-                                            placeholder="Choose first player...",
-                                            style={'fontSize': '14px', 'fontWeight': '500'}
-                                        ),
-                                    ]),
-                                    html.Div([
-                                        html.Label(
-                                            "🥈 PLAYER 2",
-                                            style={
-                                                'fontWeight': '700',
-                                                'fontSize': '13px',
-                                                'color': '#00fff2',
-                                                'marginBottom': '12px',
-                                                'display': 'block',
-                                                'fontFamily': '"Orbitron", sans-serif',
-                                                'letterSpacing': '2px',
-                                                'textShadow': '0 0 10px rgba(0, 255, 242, 0.5)'
-                                            }
-                                        ),
-                                        dcc.Dropdown(
-                                            id='player2-slicer',
-                                            options=player_options,
-                                            value='Nadal R.',
-                                            placeholder="Choose second player...",
-                                            style={'fontSize': '14px', 'fontWeight': '500'}
-                                        ),
-                                    ]),
-                                ]
-                            )
-                        ]
+                            'color': '#00fff2',
+                            'margin': '0',
+                            'fontSize': '38px',
+                            'fontWeight': '900',
+                            'fontFamily': '"Orbitron", sans-serif',
+                            'letterSpacing': '4px',
+                            'textTransform': 'uppercase',
+                            'animation': 'slideIn 1.2s ease-out',
+                            'background': 'linear-gradient(90deg, #00fff2, #00d4ff, #00fff2)',
+                            'backgroundClip': 'text',
+                            'WebkitBackgroundClip': 'text',
+                            'WebkitTextFillColor': 'transparent',
+                            'lineHeight': '1.2'
+                        }
                     ),
-                    
-                    html.Div(id='1v1-results'),
                 ]
             ),
+            
+            html.A(
+                href="https://www.kaggle.com/datasets/dissfya/atp-tennis-2000-2023daily-pull",
+                target="_blank",
+                className="source-icon",
+                style={
+                    'display': 'flex',
+                    'alignItems': 'center',
+                    'gap': '12px',
+                    'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
+                    'padding': '12px 24px',
+                    'borderRadius': '50px',
+                    'textDecoration': 'none',
+                    'boxShadow': '0 8px 20px rgba(102, 126, 234, 0.4)',
+                    'border': '2px solid #00fff2',
+                    'zIndex': '1'
+                },
+                children=[
+                    html.Span(
+                        "📊",
+                        style={'fontSize': '24px'}
+                    ),
+                    html.Span(
+                        "DATA SOURCE",
+                        style={
+                            'color': 'white',
+                            'fontFamily': '"Orbitron", sans-serif',
+                            'fontWeight': 'bold',
+                            'fontSize': '14px',
+                            'letterSpacing': '2px'
+                        }
+                    )
+                ]
+            )
+        ]
+    ),
+
+    html.Div(
+        style={
+            'maxWidth': '1600px',
+            'margin': '0 auto',
+            'padding': '60px 40px 80px 40px',
+            'position': 'relative',
+            'zIndex': '1'
+        },
+        children=[
+            dcc.Tabs(
+                id='section-tabs',
+                value='overview',
+                persistence=True,
+                persistence_type='session',
+                style={'marginBottom': '40px'},
+                children=[
+                    dcc.Tab(
+                        label=label,
+                        value=value,
+                        style=SECTION_TAB_STYLE,
+                        selected_style=SECTION_TAB_SELECTED_STYLE
+                    ) for label, value in SECTION_TABS
+                ]
+            ),
+            html.Div(id='section-content')
         ]
     )
 ])
 
 @app.callback(
-    Output('wins-treemap', 'figure'),
+    Output('section-content', 'children'),
+    Input('section-tabs', 'value')
+)
+def render_section(section):
+    return LAYOUT_SECTIONS.get(section, LAYOUT_SECTIONS['overview'])
+
+app.clientside_callback(
+    ClientsideFunction(namespace='tennis', function_name='matchesExport'),
+    [Output('matches-export-csv', 'href'), Output('matches-export-parquet', 'href')],
     [Input('surface-slicer', 'value'),
      Input('series-slicer', 'value'),
      Input('court-slicer', 'value'),
      Input('date-range-slicer', 'start_date'),
      Input('date-range-slicer', 'end_date')]
 )
+app.clientside_callback(
+    ClientsideFunction(namespace='tennis', function_name='h2hExport'),
+    [Output('h2h-export-csv', 'href'), Output('h2h-export-parquet', 'href')],
+    [Input('player1-slicer', 'value'),
+     Input('player2-slicer', 'value')]
+)
+
+@cached_callback('wins-treemap.figure')
 def update_treemap(surfaces, series, courts, start_date, end_date):
     if not all([surfaces, series, courts, start_date, end_date]):
         return {}
-    filtered_df = df[
-        df['Surface'].isin(surfaces) &
-        df['Series'].isin(series) &
-        df['Court'].isin(courts) &
-        (df['Date'] >= start_date) &
-        (df['Date'] <= end_date)
-    ].copy()
+    player_wins = query_backend.top_k(
+        'Winner', 15, surfaces=surfaces, series=series, courts=courts, start_date=start_date, end_date=end_date
+    )
     
-    if filtered_df.empty:
-        return {
-            'layout': {
-                'title': 'No Data Available for Selected Filters',
-                'paper_bgcolor': 'rgba(0,0,0,0)',
-                'plot_bgcolor': 'rgba(0,0,0,0.1)',
-                'font': {'color': '#ffffff'}
-            }
-        }
+    if player_wins.empty:
+        return empty_figure('No Data Available for Selected Filters')
         
-    player_wins = filtered_df['Winner'].value_counts().reset_index()
-    player_wins.columns = ['Winner', 'Wins']
-    player_wins = player_wins.head(15).sort_values('Wins', ascending=True)
-    
-    fig = px.bar(
-        player_wins,
-        x='Wins',
-        y='Winner',
-        orientation='h', 
-        text='Wins',     
-        color='Wins',    
-        color_continuous_scale='Tealgrn' 
-    )
-
-    fig.update_traces(
-        texttemplate='%{text}', 
-        textposition='outside',
-        marker_line_color='rgba(0, 255, 242, 0.8)',
-        marker_line_width=1,
-        opacity=0.8
-    )
-
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#ffffff', family='"Orbitron", sans-serif'),
-        xaxis_title="Number of Wins",
-        yaxis_title=None,
-        xaxis=dict(
-            showgrid=True, 
-            gridcolor='rgba(0, 255, 242, 0.1)', 
-            zeroline=False
-        ),
-        yaxis=dict(
-            showgrid=False,
-            tickfont=dict(size=11)
-        ),
-        coloraxis_showscale=False, 
-        margin=dict(l=10, r=10, t=10, b=10)
+    player_wins = player_wins.iloc[::-1]
+    wins = player_wins['count'].to_numpy()
+
+    fig = go.Figure(
+        data=[go.Bar(
+            x=wins,
+            y=player_wins['Winner'].to_numpy(),
+            orientation='h',
+            text=wins,
+            texttemplate='%{text}',
+            textposition='outside',
+            marker=dict(
+                color=wins,
+                coloraxis='coloraxis',
+                line=dict(color='rgba(0, 255, 242, 0.8)', width=1)
+            ),
+            opacity=0.8,
+            name='',
+            showlegend=False,
+            hovertemplate='Wins=%{marker.color}<br>Winner=%{y}<extra></extra>'
+        )],
+        layout=dict(
+            plot_bgcolor='rgba(0,0,0,0)',
+            font_family='"Orbitron", sans-serif',
+            barmode='relative',
+            xaxis=dict(
+                title_text="Number of Wins",
+                showgrid=True, 
+                zeroline=False
+            ),
+            yaxis=dict(
+                showgrid=False,
+                tickfont=dict(size=11)
+            ),
+            coloraxis=dict(colorscale='Tealgrn', showscale=False),
+            margin=dict(l=10, r=10, t=10, b=10)
+        )
     )
 
-    return fig
+    return compact_figure(fig)
 
-@app.callback(
-    Output('sunburst-chart', 'figure'),
-    [Input('surface-slicer', 'value'),
-     Input('series-slicer', 'value'),
-     Input('court-slicer', 'value'),
-     Input('date-range-slicer', 'start_date'),
-     Input('date-range-slicer', 'end_date')]
-)
+@cached_callback('sunburst-chart.figure', placeholder=busy_figure)
 def update_sunburst(surfaces, series, courts, start_date, end_date):
     if not all([surfaces, series, courts, start_date, end_date]):
         return {}
-    filtered_df = df[
-        df['Surface'].isin(surfaces) &
-        df['Series'].isin(series) &
-        df['Court'].isin(courts) &
-        (df['Date'] >= start_date) &
-        (df['Date'] <= end_date)
-    ].copy()
+    filtered_df = query_backend.filter(
+        ['Surface', 'Round', 'Total_sets_needed'],
+        surfaces=surfaces, series=series, courts=courts, start_date=start_date, end_date=end_date
+    )
+    report_progress(1, 2)
 
     if filtered_df.empty:
-        return {
-            'layout': {
-                'title': 'No Data Available for Selected Filters',
-                'paper_bgcolor': 'rgba(0,0,0,0)',
-                'plot_bgcolor': 'rgba(0,0,0,0.1)',
-                'font': {'color': '#ffffff'}
-            }
-        }
+        return empty_figure('No Data Available for Selected Filters')
 
     fig = px.sunburst(
         filtered_df,
         path=['Surface', 'Round', 'Total_sets_needed']
     )
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#ffffff')
+    return compact_figure(fig)
+
+def strip_figure_data(fig, keys):
+    shell = fig.to_plotly_json()
+    for key in keys:
+        shell['data'][0].pop(key, None)
+    shell['data'][0].get('marker', {}).pop('color', None)
+    return json.loads(json.dumps(shell, cls=plotly.utils.PlotlyJSONEncoder))
+
+global_filter_inputs = [
+    Input('surface-slicer', 'value'),
+    Input('series-slicer', 'value'),
+    Input('court-slicer', 'value'),
+    Input('date-range-slicer', 'start_date'),
+    Input('date-range-slicer', 'end_date')
+]
+
+filter_cube = build_filter_cube() if CLIENTSIDE_FILTERING else None
+
+if filter_cube is not None:
+    # The figure shells come from the server-side builders run over the whole
+    # dataset, so the browser only has to fill in the data arrays.
+    all_filters = [
+        df['Surface'].dropna().unique().tolist(), df['Series'].dropna().unique().tolist(),
+        df['Court'].dropna().unique().tolist(), filter_cube['origin'], df['Date'].max().strftime('%Y-%m-%d')
+    ]
+    filter_cube['kings_shell'] = strip_figure_data(update_treemap.__wrapped__(*all_filters), ['x', 'y', 'text'])
+    filter_cube['paths_shell'] = strip_figure_data(update_sunburst.__wrapped__(*all_filters), ['ids', 'labels', 'parents', 'values'])
+    filter_cube['empty_figure'] = empty_figure('No Data Available for Selected Filters')
+    filter_cube_store.data = filter_cube
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='tennis', function_name='seriesKings'),
+        Output('wins-treemap', 'figure'),
+        [Input('filter-cube', 'data')] + global_filter_inputs
     )
-    return fig
+    app.clientside_callback(
+        ClientsideFunction(namespace='tennis', function_name='pathToVictory'),
+        Output('sunburst-chart', 'figure'),
+        [Input('filter-cube', 'data')] + global_filter_inputs
+    )
+else:
+    app.callback(Output('wins-treemap', 'figure'), global_filter_inputs)(update_treemap)
+    heavy_callback(Output('sunburst-chart', 'figure'), global_filter_inputs, 'sunburst-progress')(update_sunburst)
+
+def odds_histogram(selected_category):
+    # Winner-odds bin counts per category value, as (value, occupied bins, counts);
+    # shared by the histogram chart and the JSON API.
+    result = []
+    for cat in df_odds[selected_category].unique():
+        bin_counts = np.bincount(df_odds.loc[df_odds[selected_category] == cat, 'Odds_Bin'].to_numpy())
+        occupied_bins = np.flatnonzero(bin_counts)
+        result.append((cat, occupied_bins, bin_counts[occupied_bins]))
+    return result
 
 @app.callback(
     Output('odds-box-plot', 'figure'),
     Input('category-selector', 'value')
 )
+@cached_callback('odds-box-plot.figure')
 def update_odds_distribution_histogram(selected_category):
     if df_odds.empty:
-        fig = go.Figure().update_layout(
-            title="Data unavailable",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0.1)',
-            font=dict(color='#ffffff')
-        )
-        return fig
+        return empty_figure("Data unavailable")
     
-    categories = df_odds[selected_category].unique()
-    
-    if selected_category == "Surface":
-        color_map = {'Hard': '#3b82f6', 'Clay': '#ef4444', 'Grass': '#10b981', 'Carpet': '#f59e0b'}
-    else:
-        color_map = {
-            'Grand Slam': '#4c1d95', 'Masters': '#f43f5e', 'ATP500': '#059669',
-            'ATP250': '#6366f1', 'Masters 1000': '#f59e0b', 'International Gold': '#94a3b8',
-            'International': '#f472b6', 'Masters Cup': '#c084fc'
-        }
+    color_map = SURFACE_COLORS if selected_category == "Surface" else SERIES_COLORS
 
-    fig = go.Figure()
+    traces = []
 
-    for cat in categories:
-        df_group = df_odds[df_odds[selected_category] == cat]
+    for cat, occupied_bins, counts in odds_histogram(selected_category):
         color = color_map.get(cat, '#e0e0e0')
         
-        fig.add_trace(go.Histogram(
-            x=df_group['Winner_Odd'],
+        traces.append(go.Histogram(
+            x=ODDS_BIN_START + (occupied_bins + 0.5) * ODDS_BIN_SIZE,
+            y=counts,
+            histfunc='sum',
             name=cat,
             xbins=dict(
-                start=1.0,
-                size=0.1
+                start=ODDS_BIN_START,
+                size=ODDS_BIN_SIZE
             ),
             marker_color=color,
             opacity=0.8, 
@@ -1151,13 +2427,10 @@ def update_odds_distribution_histogram(selected_category):
             hovertemplate=f'<b>{selected_category}:</b> {cat}<br><b>Odds Range:</b> %{{x}}<br><b>Count:</b> %{{y}}<extra></extra>'
         ))
     
-    fig.update_layout(
+    fig = go.Figure(data=traces, layout=dict(
         title={'text': f"Winner Odds Distribution by {selected_category}"},
         xaxis_title="Winner's Odd",
         yaxis_title="Frequency (Number of Wins)",
-        font=dict(color='#ffffff'),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0.1)',
         barmode='stack', 
         bargap=0.05,
         showlegend=True,
@@ -1169,214 +2442,625 @@ def update_odds_distribution_histogram(selected_category):
             x=1
         ),
         xaxis=dict(
-            showgrid=True, gridcolor='rgba(0, 255, 242, 0.1)', zeroline=False,
-            range=[1.0, df_odds['Winner_Odd'].quantile(0.99) + 0.5]
+            showgrid=True, zeroline=False,
+            range=[ODDS_BIN_START, ODDS_AXIS_MAX]
         ),
         yaxis=dict(
-            showgrid=True, gridcolor='rgba(0, 255, 242, 0.1)', zeroline=False
+            showgrid=True, zeroline=False
         )
-    )
+    ))
     
-    return fig
+    return compact_figure(fig)
 
 @app.callback(
+    Output('calibration-chart', 'figure'),
+    Input('category-selector', 'value')
+)
+@cached_callback('calibration-chart.figure')
+def update_calibration(selected_category):
+    table = calibration.get(selected_category)
+    if df_odds.empty or table is None:
+        return empty_figure("Data unavailable")
+
+    color_map = SURFACE_COLORS if selected_category == "Surface" else SERIES_COLORS
+    traces = [go.Scatter(
+        x=[0, 1], y=[0, 1], mode='lines', name='Perfect calibration',
+        line=dict(color='rgba(255, 255, 255, 0.4)', dash='dash'), hoverinfo='skip'
+    )]
+    for i, label in enumerate(table['labels']):
+        count = table['count'][i]
+        shown = count >= CALIBRATION_MIN_COUNT
+        if not shown.any():
+            continue
+        traces.append(go.Scatter(
+            x=(table['prob'][i][shown] / count[shown]).astype(np.float32),
+            y=(table['wins'][i][shown] / count[shown]).astype(np.float32),
+            mode='lines+markers',
+            name=f"{label} (upset index {table['upset_index'][i]:.2f})",
+            line=dict(color=color_map.get(label, '#e0e0e0'), width=2),
+            marker=dict(size=np.clip(np.sqrt(count[shown]) / 3, 4, 16).astype(np.float32)),
+            customdata=count[shown],
+            hovertemplate=f'<b>{selected_category}:</b> {label}<br><b>Implied:</b> %{{x:.1%}}<br><b>Actual:</b> %{{y:.1%}}<br><b>Players:</b> %{{customdata}}<extra></extra>'
+        ))
+
+    fig = go.Figure(data=traces, layout=dict(
+        title={'text': f"Odds Calibration by {selected_category}"},
+        xaxis=dict(title_text='Implied Win Probability', range=[0, 1], tickformat='.0%', showgrid=True),
+        yaxis=dict(title_text='Actual Win Rate', range=[0, 1], tickformat='.0%', showgrid=True),
+        legend=dict(orientation='v', x=1.02, y=1)
+    ))
+
+    return compact_figure(fig)
+
+@heavy_callback(
+    [Output('backtest-chart', 'figure'),
+     Output('backtest-leaderboard', 'children')],
+    [Input('backtest-surface', 'value'),
+     Input('backtest-series', 'value'),
+     Input('backtest-round', 'value'),
+     Input('backtest-odds', 'value')],
+    'backtest-progress'
+)
+@cached_callback('backtest', placeholder=lambda: (busy_figure(), []))
+def update_backtest(surfaces, series, rounds, odds_range):
+    if not len(backtest_data['dates']):
+        return empty_figure("Data unavailable"), []
+    min_odds, max_odds = odds_range or [1, 10]
+    band = {'min_odds': min_odds, 'max_odds': max_odds if max_odds < 10 else np.inf}
+
+    selected = [dict(band, surfaces=surfaces, series=series, rounds=rounds, side=side) for side in BACKTEST_SIDES]
+    result = backtest(selected, with_curves=True)
+    report_progress(1, 3)
+
+    traces = []
+    for i, (side, color) in enumerate(zip(BACKTEST_SIDES, ['#00fff2', '#f472b6'])):
+        curve = result['curves'][i]
+        # Long curves are thinned to ~2000 points; the last bet is always kept.
+        step = max(1, len(curve['profit']) // 2000)
+        keep = np.unique(np.append(np.arange(0, len(curve['profit']), step), len(curve['profit']) - 1)) if len(curve['profit']) else []
+        traces.append(go.Scatter(
+            x=curve['dates'][keep].astype('datetime64[ms]').astype(np.float64),
+            y=curve['profit'][keep].astype(np.float32),
+            mode='lines',
+            name=(
+                f"Back the {side.lower()}: {result['bets'][i]} bets, ROI {result['roi'][i]:+.1f}%, "
+                f"hit rate {result['hit_rate'][i]:.1f}%, max drawdown {result['max_drawdown'][i]:.1f}u"
+            ),
+            line=dict(color=color, width=2),
+            hovertemplate=f'%{{x|%Y-%m-%d}}<br>{side}: %{{y:+.1f}} units<extra></extra>'
+        ))
+
+    fig = go.Figure(data=traces, layout=dict(
+        title_text="Cumulative Profit of a 1-Unit Flat Stake",
+        xaxis=dict(type='date', showgrid=True),
+        yaxis=dict(title_text='Profit (units)', showgrid=True, zeroline=True, zerolinecolor='rgba(255, 255, 255, 0.4)'),
+        legend=dict(orientation='v', yanchor='bottom', y=1.02, xanchor='left', x=0)
+    ))
+
+    # Leaderboard over every surface x series x round x side combination in the odds band.
+    grid = [
+        dict(band, surfaces=[surface], series=[series_name], rounds=[round_name], side=side)
+        for surface in backtest_data['surfaces']
+        for series_name in backtest_data['series_labels']
+        for round_name in backtest_data['rounds']
+        for side in BACKTEST_SIDES
+    ]
+    grid_result = backtest(grid)
+    report_progress(2, 3)
+    eligible = np.flatnonzero(grid_result['bets'] >= 30)
+    best = eligible[np.argsort(-grid_result['roi'][eligible], kind='stable')][:10]
+
+    cell_style = {'padding': '10px 14px', 'borderBottom': '1px solid rgba(0, 255, 242, 0.15)', 'color': '#ffffff'}
+    header_style = dict(cell_style, color='#00fff2', fontFamily='"Orbitron", sans-serif', fontSize='12px', letterSpacing='1.5px')
+    leaderboard = html.Div(
+        style={
+            'background': 'rgba(0, 255, 242, 0.03)',
+            'borderRadius': '16px',
+            'padding': '25px',
+            'border': '1px solid rgba(0, 255, 242, 0.15)',
+            'overflowX': 'auto'
+        },
+        children=[
+            html.H3(
+                f"Top Strategies ({len(grid)} evaluated, min. 30 bets)",
+                style={
+                    'fontSize': '18px',
+                    'fontWeight': '700',
+                    'color': '#00fff2',
+                    'margin': '0 0 16px 0',
+                    'fontFamily': '"Orbitron", sans-serif',
+                    'textTransform': 'uppercase',
+                    'letterSpacing': '2px'
+                }
+            ),
+            html.Table(
+                style={'width': '100%', 'borderCollapse': 'collapse', 'fontSize': '14px'},
+                children=[
+                    html.Thead(html.Tr([
+                        html.Th(title, style=header_style)
+                        for title in ['Back', 'Surface', 'Series', 'Round', 'Bets', 'Hit %', 'ROI %', 'Max DD']
+                    ])),
+                    html.Tbody([
+                        html.Tr([
+                            html.Td(grid[i]['side'], style=cell_style),
+                            html.Td(grid[i]['surfaces'][0], style=cell_style),
+                            html.Td(grid[i]['series'][0], style=cell_style),
+                            html.Td(grid[i]['rounds'][0], style=cell_style),
+                            html.Td(f"{grid_result['bets'][i]}", style=cell_style),
+                            html.Td(f"{grid_result['hit_rate'][i]:.1f}", style=cell_style),
+                            html.Td(f"{grid_result['roi'][i]:+.1f}", style=dict(cell_style, color='#10b981' if grid_result['roi'][i] > 0 else '#ef4444')),
+                            html.Td(f"{grid_result['max_drawdown'][i]:.1f}", style=cell_style)
+                        ]) for i in best
+                    ])
+                ]
+            )
+        ]
+    )
+
+    return compact_figure(fig), leaderboard
+
+@heavy_callback(
     Output('timeline-chart', 'figure'),
     [Input('player-slicer', 'value'),
-     Input('year-slicer', 'value')]
+     Input('year-slicer', 'value')],
+    'timeline-progress'
 )
+@cached_callback('timeline-chart.figure')
 def update_timeline(player_name, selected_year):
     if not player_name or not selected_year:
         return {}
 
-    player_df = df[
-        ((df['Player_1'] == player_name) | (df['Player_2'] == player_name)) &
-        (df['Year'] == selected_year)
-    ].copy()
+    player = player_rows(player_name)
+    player = player[player['Date'].dt.year == selected_year]
 
-    if player_df.empty:
-        return {
-            'layout': {
-                'title': f"No data available for {player_name} in {selected_year}",
-                'paper_bgcolor': 'rgba(0,0,0,0)',
-                'plot_bgcolor': 'rgba(0,0,0,0.1)',
-                'font': {'color': '#ffffff'}
-            }
-        }
+    if player.empty:
+        return empty_figure(f"No data available for {player_name} in {selected_year}")
 
-    player_df = player_df.sort_values(by='Date')
-    ordered_tournaments = player_df['Tournament'].unique().tolist() 
+    player_df = df.loc[player['Match']]
+    ordered_tournaments = player_df['Tournament'].unique()
+    report_progress(1, 2)
 
-    player_df['Outcome'] = player_df.apply(
-        lambda row: 'Win' if row['Winner'] == player_name else 'Loss',
-        axis=1
-    )
-    
-    player_df['Start_Date'] = player_df['Date']
-    player_df['End_Date'] = player_df['Date'] + timedelta(days=1)
-
-    fig = px.timeline(
-        player_df,
-        x_start="Start_Date",
-        x_end="End_Date",
-        y="Tournament",
-        color="Outcome",
-        color_discrete_map={'Win': '#10b981', 'Loss': '#ef4444'},
-        title=f"Tournament Performance of {player_name} in {selected_year}",
-        hover_data=['Date', 'Round', 'Score'],
-        category_orders={'Tournament': ordered_tournaments} 
-    )
-    
-    fig.update_layout(
-        xaxis_title=None, 
-        yaxis_title=None, 
-        xaxis_type="date",
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0.1)',
-        font=dict(color='#ffffff'),
-        height=600, 
+    dates = player['Date'].to_numpy()
+    tournaments = player_df['Tournament'].to_numpy()
+    is_win = player['Win'].to_numpy()
+    customdata = np.column_stack([
+        player_df['Date'].dt.strftime('%Y-%m-%dT%H:%M:%S').to_numpy(),
+        player_df['Round'].to_numpy(),
+        player_df['Score'].to_numpy()
+    ])
+    match_duration_ms = timedelta(days=1) // timedelta(milliseconds=1)
+
+    traces = []
+    for outcome in (['Win', 'Loss'] if is_win[0] else ['Loss', 'Win']):
+        mask = is_win if outcome == 'Win' else ~is_win
+        if not mask.any():
+            continue
+        traces.append(go.Bar(
+            base=dates[mask],
+            x=np.full(mask.sum(), match_duration_ms),
+            y=tournaments[mask],
+            orientation='h',
+            name=outcome,
+            legendgroup=outcome,
+            showlegend=True,
+            textposition='auto',
+            marker_color='#10b981' if outcome == 'Win' else '#ef4444',
+            customdata=customdata[mask],
+            hovertemplate=(
+                f'Outcome={outcome}<br>Start_Date=%{{base}}<br>End_Date=%{{x}}<br>Tournament=%{{y}}'
+                '<br>Date=%{customdata[0]}<br>Round=%{customdata[1]}<br>Score=%{customdata[2]}<extra></extra>'
+            )
+        ))
+
+    fig = go.Figure(data=traces, layout=dict(
+        title_text=f"Tournament Performance of {player_name} in {selected_year}",
+        barmode='overlay',
+        height=600,
+        legend=dict(title_text='Outcome', tracegroupgap=0),
+        xaxis=dict(type='date'),
         yaxis=dict(
+            categoryorder='array',
+            categoryarray=ordered_tournaments[::-1],
             dtick=1,       
             automargin=True 
         )
-    )
+    ))
 
-    return fig
+    return compact_figure(fig)
 
 @app.callback(
     Output('radar-chart', 'figure'),
     [Input('player-slicer', 'value')]
 )
+@cached_callback('radar-chart.figure')
 def update_radar(player_name):
     if not player_name:
         return {}
 
-    player_df = df[(df['Player_1'] == player_name) | (df['Player_2'] == player_name)].copy()
+    player = player_rows(player_name)
 
-    if player_df.empty:
-        return {
-            'layout': {
-                'title': f"No data available for {player_name}",
-                'paper_bgcolor': 'rgba(0,0,0,0)',
-                'plot_bgcolor': 'rgba(0,0,0,0.1)',
-                'font': {'color': '#ffffff'}
-            }
-        }
-    
-    wins_per_surface = player_df[player_df['Winner'] == player_name]['Surface'].value_counts()
-    matches_per_surface = player_df.groupby('Surface').size()
+    if player.empty:
+        return empty_figure(f"No data available for {player_name}")
     
-    all_surfaces = player_df['Surface'].unique()
-    wins_per_surface = wins_per_surface.reindex(all_surfaces, fill_value=0)
-    matches_per_surface = matches_per_surface.reindex(all_surfaces, fill_value=0)
-
-    win_percentage = (wins_per_surface / matches_per_surface).fillna(0) * 100
-    win_percentage_df = win_percentage.reset_index()
-    win_percentage_df.columns = ['Surface', 'Win_Percentage']
-
-    fig = px.line_polar(
-        win_percentage_df,
-        r='Win_Percentage',
-        theta='Surface',
-        line_close=True,
-        range_r=[0, 100],
-        title=f"Win Percentage by Surface for {player_name}"
-    )
-    
-    fig.update_traces(fill='toself', line_color='#00fff2', fillcolor='rgba(0, 255, 242, 0.3)')
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#ffffff'),
-        polar=dict(
-            bgcolor='rgba(0,0,0,0.1)',
-            radialaxis=dict(gridcolor='rgba(0, 255, 242, 0.2)', showline=False, tickfont=dict(color="#ffffff")),
-            angularaxis=dict(gridcolor='rgba(0, 255, 242, 0.2)', showline=False, tickfont=dict(color="#ffffff"))
+    surface_codes, surfaces = pd.factorize(df['Surface'].iloc[player['Match'].to_numpy()])
+    is_win = player['Win'].to_numpy()
+    played = surface_codes >= 0
+    wins_per_surface = np.bincount(surface_codes[played & is_win], minlength=len(surfaces))
+    matches_per_surface = np.bincount(surface_codes[played], minlength=len(surfaces))
+    win_percentage = wins_per_surface / np.maximum(matches_per_surface, 1) * 100
+
+    fig = go.Figure(
+        data=[go.Scatterpolar(
+            r=np.append(win_percentage, win_percentage[:1]),
+            theta=np.append(surfaces.to_numpy(), surfaces[:1]),
+            mode='lines',
+            fill='toself',
+            line=dict(color='#00fff2', dash='solid'),
+            fillcolor='rgba(0, 255, 242, 0.3)',
+            name='',
+            showlegend=False,
+            hovertemplate='Win_Percentage=%{r}<br>Surface=%{theta}<extra></extra>'
+        )],
+        layout=dict(
+            title_text=f"Win Percentage by Surface for {player_name}",
+            polar=dict(
+                angularaxis=dict(direction='clockwise', rotation=90),
+                radialaxis=dict(range=[0, 100])
+            )
         )
     )
 
-    return fig
+    return compact_figure(fig)
 
-def create_odds_time_series(player1, player2):
-    h2h = df[
-        ((df["Player_1"] == player1) & (df["Player_2"] == player2)) |
-        ((df["Player_1"] == player2) & (df["Player_2"] == player1))
-    ].copy()
-
-    def get_player_odds(row, player):
-        return row["Odd_1"] if row["Player_1"] == player else row["Odd_2"]
-
-    h2h["Odd_p1"] = h2h.apply(lambda r: get_player_odds(r, player1), axis=1)
-    h2h["Odd_p2"] = h2h.apply(lambda r: get_player_odds(r, player2), axis=1)
-
-    plot_df = pd.melt(
-        h2h,
-        id_vars=["Date", "Tournament", "Round", "Score", "Surface"],
-        value_vars=["Odd_p1", "Odd_p2"],
-        var_name="Player_Var",
-        value_name="Odds"
-    )
+@app.callback(
+    Output('career-chart', 'figure'),
+    [Input('player-slicer', 'value')]
+)
+@cached_callback('career-chart.figure')
+def update_career_chart(player_name):
+    if not player_name:
+        return {}
 
-    plot_df["Player"] = plot_df["Player_Var"].replace({
-        "Odd_p1": player1,
-        "Odd_p2": player2
-    })
-    
-    plot_df = plot_df.sort_values("Date")
-    plot_df = plot_df.dropna(subset=['Odds'])
-    
-    fig = px.line(
-        plot_df,
-        x="Date",
-        y="Odds",
-        color="Player",
-        markers=True,
-        color_discrete_map={
-            player1: '#667eea', 
-            player2: '#f472b6' 
-        },
-        hover_data={
-            "Tournament": True,
-            "Round": True,
-            "Score": True,
-            "Surface": True,
-            "Date": '|%Y-%m-%d',
-            "Odds": ':.2f',
-            "Player_Var": False
+    pid = player_id(player_name)
+    block = career_cube[pid] if 0 <= pid < len(career_cube) else career_cube[:0].sum(axis=0)
+    played = block[:, :, 0].sum(axis=1) > 0
+    if not played.any():
+        return empty_figure(f"No data available for {player_name}")
+
+    active = np.flatnonzero(played)
+    block = block[active[0]:active[-1] + 1].astype(np.int32)
+    years = np.asarray(all_years)[active[0]:active[-1] + 1]
+    totals = block.sum(axis=1)
+
+    traces = [
+        go.Bar(x=years, y=totals[:, 0], name='Matches', marker_color='rgba(102, 126, 234, 0.45)',
+               hovertemplate='%{x}<br>Matches: %{y}<extra></extra>'),
+        go.Bar(x=years, y=totals[:, 1], name='Wins', marker_color='rgba(16, 185, 129, 0.7)',
+               hovertemplate='%{x}<br>Wins: %{y}<extra></extra>'),
+        go.Scatter(x=years, y=totals[:, 2], name='Titles', mode='markers+text', text=totals[:, 2],
+                   textposition='top center', marker=dict(symbol='star', size=12, color='#f59e0b'),
+                   hovertemplate='%{x}<br>Titles: %{y}<extra></extra>')
+    ]
+    for s, surface in enumerate(SURFACES):
+        matches = block[:, s, 0]
+        if not matches.any():
+            continue
+        traces.append(go.Scatter(
+            x=years, y=np.where(matches > 0, block[:, s, 1] / np.maximum(matches, 1) * 100, np.nan).astype(np.float32),
+            name=f'{surface} Win %', mode='lines+markers', yaxis='y2', connectgaps=False,
+            line=dict(color=SURFACE_COLORS[surface], width=2),
+            hovertemplate=f'%{{x}}<br>{surface} Win %: %{{y:.1f}}<extra></extra>'
+        ))
+
+    fig = go.Figure(data=traces, layout=dict(
+        title_text=f"Career Trajectory of {player_name}",
+        barmode='overlay',
+        xaxis=dict(dtick=1, showgrid=False),
+        yaxis=dict(title_text='Matches / Wins / Titles', showgrid=True),
+        yaxis2=dict(title_text='Win %', overlaying='y', side='right', range=[0, 105], showgrid=False),
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
+    ))
+
+    return compact_figure(fig)
+
+@app.callback(
+    Output('elo-chart', 'figure'),
+    [Input('player-slicer', 'value')]
+)
+@cached_callback('elo-chart.figure')
+def update_elo_chart(player_name):
+    if not player_name:
+        return {}
+
+    player = player_rows(player_name)
+    if player.empty:
+        return empty_figure(f"No data available for {player_name}")
+
+    rows = player['Match'].to_numpy()
+    as_player_1 = (player['Side'] == 0).to_numpy()
+    # Epoch milliseconds on a date axis travel as a typed buffer instead of ISO strings.
+    dates = player['Date'].to_numpy().astype('datetime64[ms]').astype(np.float64)
+    surfaces = df['Surface'].to_numpy()[rows]
+    overall = np.where(as_player_1, df['Elo_1'].to_numpy()[rows], df['Elo_2'].to_numpy()[rows]).astype(np.float32)
+    on_surface = np.where(as_player_1, df['Surface_Elo_1'].to_numpy()[rows], df['Surface_Elo_2'].to_numpy()[rows]).astype(np.float32)
+
+    traces = [go.Scatter(
+        x=dates, y=overall, mode='lines', name='Overall',
+        line=dict(color='#00fff2', width=3),
+        hovertemplate='%{x|%Y-%m-%d}<br>Overall Elo: %{y:.0f}<extra></extra>'
+    )]
+    for surface in SURFACES:
+        mask = surfaces == surface
+        if not mask.any():
+            continue
+        traces.append(go.Scatter(
+            x=dates[mask], y=on_surface[mask], mode='lines', name=surface,
+            line=dict(color=SURFACE_COLORS[surface], width=1.5),
+            hovertemplate=f'%{{x|%Y-%m-%d}}<br>{surface} Elo: %{{y:.0f}}<extra></extra>'
+        ))
+
+    fig = go.Figure(data=traces, layout=dict(
+        title_text=f"Elo Rating Before Each Match for {player_name}",
+        xaxis=dict(type='date', showgrid=True),
+        yaxis=dict(title_text='Elo', showgrid=True),
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
+    ))
+
+    return compact_figure(fig)
+
+@app.callback(
+    [Output('break-points-year-chart', 'figure'),
+     Output('break-points-surface-chart', 'figure')],
+    [Input('player-slicer', 'value')]
+)
+@cached_callback('break-points-charts')
+def update_break_points(player_name):
+    if not player_name:
+        return {}, {}
+
+    starts = break_point_stats['player_starts']
+    pid = player_id(player_name)
+    if not 0 <= pid < len(starts) - 1 or starts[pid] == starts[pid + 1]:
+        no_data = empty_figure(f"No break point data available for {player_name}")
+        return no_data, no_data
+
+    player_stats = break_point_stats['by_surface_year'].iloc[starts[pid]:starts[pid + 1]].droplevel('Player_id')
+    figures = []
+    for level, title, axis in [
+        ('Year', f"Break Points per Match by Year for {player_name}", dict(dtick=1)),
+        ('Surface', "Break Points per Match by Surface", dict(categoryorder='array', categoryarray=SURFACES))
+    ]:
+        totals = player_stats.groupby(level=level).sum()
+        matches = totals['Matches'].to_numpy()
+        traces = [
+            go.Bar(
+                x=totals.index.to_numpy(),
+                y=(totals[column].to_numpy() / matches).astype(np.float32),
+                name=name,
+                marker_color=color,
+                customdata=np.column_stack([totals[column].to_numpy(), matches]),
+                hovertemplate=f'{level}=%{{x}}<br>{name}: %{{y:.2f}} per match<br>Total=%{{customdata[0]:.0f}} in %{{customdata[1]}} matches<extra></extra>'
+            )
+            for column, name, color in [('Own', 'Earned', '#00fff2'), ('Opponent', 'Conceded', '#f472b6')]
+        ]
+        figures.append(compact_figure(go.Figure(data=traces, layout=dict(
+            title_text=title,
+            barmode='group',
+            xaxis=axis,
+            yaxis=dict(title_text='Per match', showgrid=True),
+            legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
+        ))))
+
+    return figures[0], figures[1]
+
+@app.callback(
+    Output('similar-players', 'children'),
+    [Input('player-slicer', 'value')]
+)
+@cached_callback('similar-players.children')
+def update_similar_players(player_name):
+    if not player_name:
+        return []
+
+    matches = similar_players(player_name)
+    if not matches:
+        return html.Div(f"Not enough matches to find players similar to {player_name}.",
+                        style={'color': '#00fff2', 'textAlign': 'center', 'padding': '20px'})
+
+    return html.Div(
+        style={
+            'background': 'rgba(0, 255, 242, 0.03)',
+            'borderRadius': '16px',
+            'padding': '25px',
+            'border': '1px solid rgba(0, 255, 242, 0.15)'
         },
-        title=f"Odds Change Over: {player1} vs {player2}"
+        children=[
+            html.H3(
+                f"Players Most Similar to {player_name}",
+                style={
+                    'fontSize': '18px',
+                    'fontWeight': '700',
+                    'color': '#00fff2',
+                    'margin': '0 0 20px 0',
+                    'fontFamily': '"Orbitron", sans-serif',
+                    'textTransform': 'uppercase',
+                    'letterSpacing': '2px'
+                }
+            ),
+            html.Div(
+                style={
+                    'display': 'grid',
+                    'gridTemplateColumns': 'repeat(auto-fit, minmax(180px, 1fr))',
+                    'gap': '16px'
+                },
+                children=[
+                    html.Div(
+                        style={
+                            'background': 'rgba(15, 23, 42, 0.8)',
+                            'borderRadius': '12px',
+                            'padding': '18px',
+                            'textAlign': 'center',
+                            'border': '1px solid rgba(0, 255, 242, 0.2)'
+                        },
+                        children=[
+                            html.P(name, style={'margin': '0 0 8px 0', 'fontWeight': '700', 'color': '#ffffff'}),
+                            html.P(
+                                f"{score * 100:.0f}% similar",
+                                style={
+                                    'margin': '0',
+                                    'color': '#00fff2',
+                                    'fontFamily': '"Orbitron", sans-serif',
+                                    'fontSize': '13px'
+                                }
+                            )
+                        ]
+                    ) for name, score in matches
+                ]
+            )
+        ]
     )
 
-    fig.update_layout(
-        font=dict(color='#ffffff'),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0.1)',
-        xaxis=dict(showgrid=True, gridcolor='rgba(0, 255, 242, 0.1)'),
-        yaxis=dict(showgrid=True, gridcolor='rgba(0, 255, 242, 0.1)', range=[1, plot_df['Odds'].max() * 1.1])
+@app.callback(
+    Output('draw-chart', 'figure'),
+    [Input('draw-slicer', 'value')]
+)
+@cached_callback('draw-chart.figure')
+def update_draw(edition):
+    if edition is None or not 0 <= edition < len(draws['editions']):
+        return {}
+
+    start, end = draws['starts'][edition], draws['starts'][edition + 1]
+    if start == end:
+        return empty_figure(f"No matches available for {draws['editions'][edition]}")
+
+    matches = draws['match'][start:end]
+    levels, column = np.unique(draws['round'][start:end], return_inverse=True)
+    y = draws['y'][start:end]
+    parent = draws['parent'][start:end] - start
+    round_names = df['Round'].to_numpy()[matches]
+    player_1 = df['Player_1'].to_numpy()[matches]
+    player_2 = df['Player_2'].to_numpy()[matches]
+    winners = df['Winner'].to_numpy()[matches]
+
+    edge_x, edge_y = [], []
+    for child in np.flatnonzero(draws['parent'][start:end] >= 0):
+        x_child, x_parent = column[child], column[parent[child]]
+        edge_x += [x_child, x_child + 0.5, x_child + 0.5, x_parent, None]
+        edge_y += [y[child], y[child], y[parent[child]], y[parent[child]], None]
+
+    fig = go.Figure(
+        data=[
+            go.Scatter(
+                x=edge_x, y=edge_y, mode='lines', hoverinfo='skip', showlegend=False,
+                line=dict(color='rgba(0, 255, 242, 0.35)', width=1)
+            ),
+            go.Scatter(
+                x=column, y=y, mode='markers+text', showlegend=False,
+                text=winners, textposition='top center', textfont=dict(size=10),
+                marker=dict(size=8, color='#00fff2'),
+                customdata=np.column_stack([round_names, player_1, player_2, df['Score'].to_numpy()[matches]]),
+                hovertemplate='%{customdata[0]}<br>%{customdata[1]} vs %{customdata[2]}<br>Winner=%{text}<br>Score=%{customdata[3]}<extra></extra>'
+            )
+        ],
+        layout=dict(
+            title_text=f"Draw of {draws['editions'][edition]}",
+            height=max(450, 26 * np.bincount(column).max()),
+            xaxis=dict(
+                tickmode='array',
+                tickvals=np.arange(len(levels)),
+                ticktext=[round_names[column == i][0] for i in range(len(levels))],
+                showgrid=False, zeroline=False
+            ),
+            yaxis=dict(autorange='reversed', visible=False)
+        )
     )
+
+    return compact_figure(fig)
+
+def create_odds_time_series(player1, player2):
+    h2h = h2h_rows(player1, player2)
+
+    dates = h2h['Date'].to_numpy()
+    odd_1 = h2h['Own_Odd'].to_numpy()
+    odd_2 = h2h['Opponent_Odd'].to_numpy()
+    customdata = df[['Tournament', 'Round', 'Score', 'Surface']].to_numpy()[h2h['Match'].to_numpy()]
+
+    traces = []
+    for player, odds, color in [
+        (player1, odd_1, '#667eea'),
+        (player2, odd_2, '#f472b6')
+    ]:
+        priced = ~np.isnan(odds)
+        traces.append(go.Scatter(
+            x=dates[priced],
+            y=odds[priced],
+            mode='lines+markers',
+            name=player,
+            legendgroup=player,
+            showlegend=True,
+            line=dict(color=color, dash='solid'),
+            marker=dict(symbol='circle'),
+            customdata=customdata[priced],
+            hovertemplate=(
+                f'Player={player}<br>Date=%{{x|%Y-%m-%d}}<br>Odds=%{{y:.2f}}<br>Tournament=%{{customdata[0]}}'
+                '<br>Round=%{customdata[1]}<br>Score=%{customdata[2]}<br>Surface=%{customdata[3]}<extra></extra>'
+            )
+        ))
+
+    max_odds = np.nanmax(np.concatenate([odd_1, odd_2])) if len(h2h) else np.nan
+    fig = go.Figure(data=traces, layout=dict(
+        title_text=f"Odds Change Over: {player1} vs {player2}",
+        legend=dict(title_text='Player', tracegroupgap=0),
+        xaxis=dict(title_text='Date', showgrid=True),
+        yaxis=dict(title_text='Odds', showgrid=True, range=[1, max_odds * 1.1])
+    ))
     
-    return fig
+    return compact_figure(fig)
+
+def player_kpis(player_name):
+    # Career numbers behind the KPI cards, shared with the JSON API.
+    player = player_rows(player_name)
+    if player.empty:
+        return None
+
+    final_wins_df = df.loc[player.loc[player['Win'], 'Match']]
+    final_wins_df = final_wins_df[final_wins_df['Round'] == 'Final']
+    form = player.iloc[-1]
+    return dict(
+        {
+            'total_matches': len(player),
+            'career_wins': int(player['Win'].sum()),
+            'tour_titles': len(final_wins_df),
+            'grand_slams': int((final_wins_df['Series'] == 'Grand Slam').sum()),
+            'form_wins': int(form['Form_Wins']),
+            'form_matches': int(form['Form_Matches']),
+            'current_streak': int(form['Streak']),
+            'longest_win_streak': int(form['Longest_Win_Streak'])
+        },
+        **{key: float(value) if isinstance(value, (float, np.floating)) else int(value) for key, value in player_score_stats(player_name).items()}
+    )
 
 @app.callback(
     Output('player-kpi-row', 'children'),
     [Input('player-slicer', 'value')]
 )
+@cached_callback('player-kpi-row.children')
 def update_player_kpis(player_name):
     if not player_name:
         return []
 
-    player_df = df[(df['Player_1'] == player_name) | (df['Player_2'] == player_name)].copy()
+    stats = player_kpis(player_name)
 
-    if player_df.empty:
+    if stats is None:
         return [html.Div(f"No career data available for {player_name}.", 
                          style={'color': '#00fff2', 'textAlign': 'center', 'padding': '20px'})]
 
-    total_matches = len(player_df)
-    total_wins = len(player_df[player_df['Winner'] == player_name])
-    
-    final_wins_df = player_df[(player_df['Winner'] == player_name) & (player_df['Round'] == 'Final')]
-    gs_titles = final_wins_df[final_wins_df['Series'] == 'Grand Slam'].shape[0]
-    total_final_wins = final_wins_df.shape[0]
-    atp_tour_titles = total_final_wins
+    total_matches = stats['total_matches']
+    total_wins = stats['career_wins']
+    gs_titles = stats['grand_slams']
+    atp_tour_titles = stats['tour_titles']
+    score_stats = stats
+    streak = stats['current_streak']
 
     def create_kpi_card(title, value, icon, gradient):
         return html.Div(
@@ -1430,7 +3114,13 @@ def update_player_kpis(player_name):
         {'title': 'Total Matches', 'value': total_matches, 'icon': '🎾', 'bg': 'linear-gradient(135deg, rgba(102, 126, 234, 0.3) 0%, rgba(118, 75, 162, 0.3) 100%)'},
         {'title': 'Career Wins', 'value': total_wins, 'icon': '🏆', 'bg': 'linear-gradient(135deg, rgba(17, 153, 142, 0.3) 0%, rgba(56, 239, 125, 0.3) 100%)'},
         {'title': 'Tour Titles', 'value': atp_tour_titles, 'icon': '🥇', 'bg': 'linear-gradient(135deg, rgba(245, 158, 11, 0.3) 0%, rgba(249, 115, 22, 0.3) 100%)'},
-        {'title': 'Grand Slams', 'value': gs_titles, 'icon': '👑', 'bg': 'linear-gradient(135deg, rgba(217, 70, 239, 0.3) 0%, rgba(139, 92, 246, 0.3) 100%)'}
+        {'title': 'Grand Slams', 'value': gs_titles, 'icon': '👑', 'bg': 'linear-gradient(135deg, rgba(217, 70, 239, 0.3) 0%, rgba(139, 92, 246, 0.3) 100%)'},
+        {'title': 'Games Won', 'value': f"{score_stats['games_won_pct']:.1f}%", 'icon': '🎯', 'bg': 'linear-gradient(135deg, rgba(59, 130, 246, 0.3) 0%, rgba(0, 255, 242, 0.3) 100%)'},
+        {'title': 'Tiebreaks W-L', 'value': f"{score_stats['tiebreaks_won']}-{score_stats['tiebreaks_lost']}", 'icon': '⚡', 'bg': 'linear-gradient(135deg, rgba(252, 70, 107, 0.3) 0%, rgba(63, 94, 251, 0.3) 100%)'},
+        {'title': 'Straight-Set Wins', 'value': f"{score_stats['straight_sets_pct']:.0f}%", 'icon': '💨', 'bg': 'linear-gradient(135deg, rgba(16, 185, 129, 0.3) 0%, rgba(245, 158, 11, 0.3) 100%)'},
+        {'title': f'Form (Last {FORM_WINDOW})', 'value': f"{stats['form_wins']}-{stats['form_matches'] - stats['form_wins']}", 'icon': '📊', 'bg': 'linear-gradient(135deg, rgba(0, 255, 242, 0.3) 0%, rgba(102, 126, 234, 0.3) 100%)'},
+        {'title': 'Current Streak', 'value': f"{'W' if streak > 0 else 'L'}{abs(streak)}", 'icon': '🔥', 'bg': 'linear-gradient(135deg, rgba(249, 115, 22, 0.3) 0%, rgba(239, 68, 68, 0.3) 100%)'},
+        {'title': 'Longest Win Streak', 'value': stats['longest_win_streak'], 'icon': '🚀', 'bg': 'linear-gradient(135deg, rgba(139, 92, 246, 0.3) 0%, rgba(236, 72, 153, 0.3) 100%)'}
     ]
     
     kpis = html.Div(
@@ -1444,46 +3134,70 @@ def update_player_kpis(player_name):
 
     return kpis
 
+def h2h_summary(player1, player2):
+    # The numbers behind the H2H view, shared with the JSON API. Meetings are
+    # newest first.
+    h2h = h2h_rows(player1, player2)
+    if h2h.empty:
+        return None
+
+    h2h_df = df.loc[h2h['Match']]
+    keys = break_point_stats['h2h_keys']
+    key = player_id(player1) * (player_match_index['n_players'] + 1) + player_id(player2) + 1
+    i = np.searchsorted(keys, key)
+    break_points = None
+    if i < len(keys) and keys[i] == key:
+        break_points = (int(break_point_stats['h2h'][i, 1]), int(break_point_stats['h2h'][i, 2]))
+    return {
+        'matches': len(h2h),
+        'player1_wins': int(h2h['Win'].sum()),
+        'player2_wins': int((h2h_df['Winner'] == player2).sum()),
+        'break_points': break_points,
+        'rounds': h2h_df['Round'].value_counts(),
+        'meetings': h2h_df.iloc[::-1]
+    }
+
 @app.callback(
     Output('1v1-results', 'children'),
     [Input('player1-slicer', 'value'),
      Input('player2-slicer', 'value')]
 )
+@cached_callback('1v1-results.children')
 def update_1v1_comparison(player1, player2):
     if not player1 or not player2:
         return html.Div("Please select two players to compare.", 
                         style={'color': '#00fff2', 'textAlign': 'center', 'padding': '20px'})
 
-    h2h_df = df[
-        ((df['Player_1'] == player1) & (df['Player_2'] == player2)) |
-        ((df['Player_1'] == player2) & (df['Player_2'] == player1))
-    ].copy()
+    summary = h2h_summary(player1, player2)
 
-    if h2h_df.empty:
+    if summary is None:
         return html.Div("No head-to-head matches found for these players.", 
                         style={'color': '#00fff2', 'textAlign': 'center', 'padding': '20px'})
 
-    total_matches = len(h2h_df)
-    p1_wins = len(h2h_df[h2h_df['Winner'] == player1])
-    p2_wins = len(h2h_df[h2h_df['Winner'] == player2])
+    total_matches = summary['matches']
+    p1_wins = summary['player1_wins']
+    p2_wins = summary['player2_wins']
     
-    last_3_matches = h2h_df.sort_values(by='Date', ascending=False).head(3)
+    last_3_matches = summary['meetings'].head(3)
+
+    break_points = summary['break_points']
+    break_points_text = f"{break_points[0]:.0f} - {break_points[1]:.0f}" if break_points else "N/A"
 
-    round_counts = h2h_df['Round'].value_counts().reset_index()
-    round_counts.columns = ['Round', 'Matches']
+    round_counts = summary['rounds']
     
     round_chart = dcc.Graph(
-        figure=px.pie(
-            round_counts, 
-            names='Round', 
-            values='Matches', 
-            hole=0.4, 
-            title="Meetings by Round"
-        ).update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#ffffff')
-        )
+        figure=compact_figure(go.Figure(
+            data=[go.Pie(
+                labels=round_counts.index.to_numpy(),
+                values=round_counts.to_numpy(),
+                hole=0.4,
+                name='',
+                legendgroup='',
+                showlegend=True,
+                hovertemplate='Round=%{label}<br>Matches=%{value}<extra></extra>'
+            )],
+            layout=dict(title_text="Meetings by Round", legend_tracegroupgap=0)
+        ))
     )
     
     odds_line_chart = dcc.Graph(
@@ -1594,6 +3308,38 @@ def update_1v1_comparison(player1, player2):
                                 })
                     ]
                 ),
+
+                html.Div(
+                    style={
+                        'background': 'linear-gradient(135deg, rgba(245, 158, 11, 0.3) 0%, rgba(249, 115, 22, 0.3) 100%)',
+                        'borderRadius': '16px',
+                        'padding': '32px 24px',
+                        'textAlign': 'center',
+                        'boxShadow': '0 0 30px rgba(0, 255, 242, 0.2)',
+                        'border': '2px solid rgba(0, 255, 242, 0.3)'
+                    },
+                    children=[
+                        html.Div("🎯", style={'fontSize': '36px', 'marginBottom': '12px'}),
+                        html.P("BREAK POINTS", 
+                               style={
+                                   'fontSize': '12px',
+                                   'fontWeight': '700',
+                                   'margin': '0 0 10px 0',
+                                   'color': 'rgba(255, 255, 255, 0.9)',
+                                   'fontFamily': '"Orbitron", sans-serif',
+                                   'letterSpacing': '1.5px'
+                               }),
+                        html.H2(break_points_text, 
+                                style={
+                                    'fontSize': '42px',
+                                    'fontWeight': 'bold',
+                                    'margin': '0',
+                                    'color': '#00fff2',
+                                    'textShadow': '0 0 20px rgba(0, 255, 242, 0.8)',
+                                    'fontFamily': '"Orbitron", sans-serif'
+                                })
+                    ]
+                ),
             ]
         ),
         
@@ -1761,5 +3507,270 @@ def update_1v1_comparison(player1, player2):
         ]),
     ])
 
+API_DEFAULT_LIMIT = 50
+API_MAX_LIMIT = 1000
+
+api = Blueprint('api_v1', __name__, url_prefix='/api/v1')
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+@api.errorhandler(ApiError)
+def handle_api_error(error):
+    return jsonify(error=error.message), error.status
+
+def api_list_param(name):
+    value = request.args.get(name)
+    return [item for item in value.split(',') if item] if value else None
+
+def api_int_param(name, default, maximum):
+    value = request.args.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ApiError(f"'{name}' must be an integer")
+    if not 0 <= value <= maximum:
+        raise ApiError(f"'{name}' must be between 0 and {maximum}")
+    return value
+
+def api_select(item, fields):
+    return {key: item[key] for key in fields if key in item} if fields else item
+
+def api_request_etag():
+    return hashlib.sha1(f'{DATASET_VERSION}:{CODE_VERSION}:{request.full_path}'.encode()).hexdigest()[:20]
+
+def api_endpoint(func):
+    # Responses only change with the data or the code, so the ETag is derived from
+    # both versions plus the exact request. A request is only answered 304 once it
+    # is known to succeed: straight away if this worker already served it, after
+    # running the handler otherwise, so bad parameters still get their 400 or 404.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        etag = api_request_etag()
+        matched = not_modified_etag(etag)
+        if matched is not None and etag in served_etags:
+            return not_modified_response(matched)
+        data, total = func(*args, **kwargs)
+        fields = api_list_param('fields')
+        meta = {'dataset_version': DATASET_VERSION}
+        if total is not None:
+            limit = api_int_param('limit', API_DEFAULT_LIMIT, API_MAX_LIMIT)
+            offset = api_int_param('offset', 0, max(total, 0))
+            meta.update(total=total, limit=limit, offset=offset)
+            data = [api_select(item, fields) for item in data[offset:offset + limit]]
+        else:
+            data = api_select(data, fields)
+        remember_served_etag(etag)
+        if matched is not None:
+            return not_modified_response(matched)
+        return set_http_cache_headers(jsonify(data=data, meta=meta), etag)
+    return wrapper
+
+@api.route('/players')
+@api_endpoint
+def api_players():
+    return [{'name': name} for name in all_players], len(all_players)
+
+@api.route('/series-kings')
+@api_endpoint
+def api_series_kings():
+    filters = {key: api_list_param(key) for key in ['surfaces', 'series', 'courts']}
+    filters.update({key: request.args.get(key) for key in ['start_date', 'end_date']})
+    try:
+        ranking = query_backend.top_k('Winner', len(all_players), **filters)
+    except ValueError as error:
+        raise ApiError(str(error))
+    data = [
+        {'rank': rank, 'player': player, 'wins': int(wins)}
+        for rank, (player, wins) in enumerate(zip(ranking['Winner'], ranking['count']), start=1)
+    ]
+    return data, len(data)
+
+@api.route('/players/<path:player_name>/kpis')
+@api_endpoint
+def api_player_kpis(player_name):
+    stats = player_kpis(player_name)
+    if stats is None:
+        raise ApiError(f"No matches found for player '{player_name}'", status=404)
+    return dict(stats, player=player_name), None
+
+@api.route('/h2h')
+@api_endpoint
+def api_h2h():
+    player1, player2 = request.args.get('player1'), request.args.get('player2')
+    if not player1 or not player2:
+        raise ApiError("'player1' and 'player2' are required")
+    summary = h2h_summary(player1, player2)
+    if summary is None:
+        raise ApiError(f"No head-to-head matches found for '{player1}' and '{player2}'", status=404)
+    meetings = summary['meetings']
+    return {
+        'player1': player1,
+        'player2': player2,
+        'matches': summary['matches'],
+        'player1_wins': summary['player1_wins'],
+        'player2_wins': summary['player2_wins'],
+        'player1_break_points': summary['break_points'][0] if summary['break_points'] else None,
+        'player2_break_points': summary['break_points'][1] if summary['break_points'] else None,
+        'rounds': {round_name: int(count) for round_name, count in summary['rounds'].items()},
+        'meetings': [
+            {'date': date.strftime('%Y-%m-%d'), 'tournament': tournament, 'round': round_name, 'winner': winner, 'score': score}
+            for date, tournament, round_name, winner, score in zip(
+                meetings['Date'], meetings['Tournament'], meetings['Round'], meetings['Winner'], meetings['Score']
+            )
+        ]
+    }, None
+
+@api.route('/odds-histogram')
+@api_endpoint
+def api_odds_histogram():
+    category = request.args.get('category', 'Series')
+    if category not in ('Surface', 'Series'):
+        raise ApiError("'category' must be 'Surface' or 'Series'")
+    data = [
+        {
+            'category': cat,
+            'odds_from': round(ODDS_BIN_START + int(bin_index) * ODDS_BIN_SIZE, 2),
+            'odds_to': round(ODDS_BIN_START + (int(bin_index) + 1) * ODDS_BIN_SIZE, 2),
+            'wins': int(count)
+        }
+        for cat, bins, counts in odds_histogram(category)
+        for bin_index, count in zip(bins, counts)
+    ]
+    return data, len(data)
+
+EXPORT_COLUMNS = [
+    'Date', 'Tournament', 'Series', 'Court', 'Surface', 'Round', 'Player_1', 'Player_2', 'Winner',
+    'Score', 'Total_sets_needed', 'Odd_1', 'Odd_2', 'Break_pts_1', 'Break_pts_2'
+]
+EXPORT_INT_COLUMNS = ['Total_sets_needed']
+EXPORT_FLOAT_COLUMNS = ['Odd_1', 'Odd_2', 'Break_pts_1', 'Break_pts_2']
+EXPORT_CHUNK_ROWS = 10000
+EXPORT_FORMATS = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+
+class ExportSink(io.RawIOBase):
+    # Collects what the parquet writer emits, so each row group is sent as soon
+    # as it is written instead of building the whole file first.
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.size
+
+    def drain(self):
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+def csv_stream(chunks):
+    for i, chunk in enumerate(chunks):
+        yield chunk.to_csv(index=False, header=i == 0, date_format='%Y-%m-%d').encode()
+
+def parquet_stream(chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    # A fixed schema rather than one inferred from the first chunk: the SQL
+    # backends type each chunk on its own, so a column that is all NULL in one
+    # chunk must still fit the file.
+    schema = pa.schema([
+        (column, pa.timestamp('ns') if column == 'Date' else pa.int64() if column in EXPORT_INT_COLUMNS
+         else pa.float64() if column in EXPORT_FLOAT_COLUMNS else pa.string())
+        for column in EXPORT_COLUMNS
+    ])
+    sink = ExportSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for chunk in chunks:
+        writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+def frame_chunks(frame):
+    for start in range(0, max(len(frame), 1), EXPORT_CHUNK_ROWS):
+        yield frame.iloc[start:start + EXPORT_CHUNK_ROWS]
+
+def export_response(chunks, filename):
+    # Rows go out chunk by chunk, so a large date range never holds the filtered
+    # frame, or the file, in memory at once.
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        raise ApiError("'format' must be 'csv' or 'parquet'")
+    if export_format == 'parquet':
+        try:
+            import pyarrow
+        except ImportError:
+            raise ApiError('Parquet export requires the pyarrow package', status=501)
+    # The first chunk is taken here so bad filters still get a JSON error, and
+    # only a request that gets this far can be answered 304.
+    try:
+        chunks = itertools.chain([next(chunks)], chunks)
+    except ValueError as error:
+        raise ApiError(str(error))
+    etag = api_request_etag()
+    matched = not_modified_etag(etag)
+    if matched is not None:
+        return not_modified_response(matched)
+    response = Response(
+        parquet_stream(chunks) if export_format == 'parquet' else csv_stream(chunks),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}.{export_format}"'}
+    )
+    return set_http_cache_headers(response, etag)
+
+@api.route('/export/matches')
+def api_export_matches():
+    filters = {key: api_list_param(key) for key in ['surfaces', 'series', 'courts']}
+    filters.update({key: request.args.get(key) for key in ['start_date', 'end_date']})
+    return export_response(query_backend.iter_filter(EXPORT_COLUMNS, EXPORT_CHUNK_ROWS, **filters), 'matches')
+
+@api.route('/export/h2h')
+def api_export_h2h():
+    player1, player2 = request.args.get('player1'), request.args.get('player2')
+    if not player1 or not player2:
+        raise ApiError("'player1' and 'player2' are required")
+    matches = query_backend.h2h_matches(player1, player2, EXPORT_COLUMNS)
+    if matches.empty:
+        raise ApiError(f"No head-to-head matches found for '{player1}' and '{player2}'", status=404)
+    return export_response(frame_chunks(matches), re.sub(r'[^A-Za-z0-9]+', '_', f'h2h {player1} {player2}').strip('_'))
+
+server.register_blueprint(api)
+
+@server.route('/_metrics')
+def metrics():
+    with shed_lock:
+        shed_requests = dict(shed_counts)
+    response = jsonify({
+        'callbacks': callback_flights.stats(),
+        'shed': shed_requests,
+        'limits': {
+            callback_id: {'concurrency': concurrency, 'queue_budget': budget}
+            for callback_id, (_, concurrency, budget) in callback_limits.items()
+        }
+    })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+# With CALLBACK_PROCESSES > 0 the cached callbacks run in a pool of processes,
+# so a threaded worker can use all cores without running more full Dash workers.
+# The pool is started once the serving process exists and before it starts its
+# request threads: by gunicorn.conf.py in each gunicorn worker, below for the
+# dev server.
+if CALLBACK_PROCESSES > 0:
+    callback_pool = CallbackPool(CALLBACK_PROCESSES, CALLBACK_QUEUE_SIZE, CALLBACK_TIMEOUT)
+
 if __name__ == '__main__':
+    if callback_pool is not None:
+        callback_pool.start()
     app.run(debug=False)
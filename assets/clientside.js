@@ -0,0 +1,206 @@
+(function () {
+    var DAY_MS = 86400000;
+
+    var ARRAY_TYPES = {
+        uint8: Uint8Array, uint16: Uint16Array, uint32: Uint32Array,
+        int8: Int8Array, int16: Int16Array, int32: Int32Array
+    };
+
+    var decodedCache = new WeakMap();
+
+    function decodeColumns(columns) {
+        if (decodedCache.has(columns)) {
+            return decodedCache.get(columns);
+        }
+        var decoded = {};
+        Object.keys(columns).forEach(function (name) {
+            var binary = atob(columns[name].bdata);
+            var bytes = new Uint8Array(binary.length);
+            for (var i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            decoded[name] = new ARRAY_TYPES[columns[name].dtype](bytes.buffer);
+        });
+        decodedCache.set(columns, decoded);
+        return decoded;
+    }
+
+    function allowedCodes(labels, selected) {
+        var allowed = new Uint8Array(labels.length);
+        (selected || []).forEach(function (value) {
+            var index = labels.indexOf(value);
+            if (index >= 0) {
+                allowed[index] = 1;
+            }
+        });
+        return allowed;
+    }
+
+    function dayOffset(origin, value) {
+        return Math.round((Date.parse(String(value).slice(0, 10)) - Date.parse(origin)) / DAY_MS);
+    }
+
+    function firstAtLeast(sorted, value) {
+        var lo = 0, hi = sorted.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (sorted[mid] < value) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+
+    function clone(value) {
+        return JSON.parse(JSON.stringify(value));
+    }
+
+    function dayRange(cube, days, startDate, endDate) {
+        // Rows are sorted by day, so the date range is the slice between the
+        // first row of the first day in range and the first row after the last.
+        var index = decodeColumns(days);
+        return [
+            index.start[firstAtLeast(index.d, dayOffset(cube.origin, startDate))],
+            index.start[firstAtLeast(index.d, dayOffset(cube.origin, endDate) + 1)]
+        ];
+    }
+
+    function rowFilter(cube, rows, surfaces, series, courts) {
+        var surfaceOk = allowedCodes(cube.surfaces, surfaces);
+        var seriesOk = allowedCodes(cube.series, series);
+        var courtOk = allowedCodes(cube.courts, courts);
+        return function (i) {
+            return surfaceOk[rows.s[i]] && seriesOk[rows.se[i]] && courtOk[rows.c[i]];
+        };
+    }
+
+    function exportUrls(path, params) {
+        var query = Object.keys(params).filter(function (key) {
+            var value = params[key];
+            return value !== null && value !== undefined && !(Array.isArray(value) && !value.length);
+        }).map(function (key) {
+            var value = Array.isArray(params[key]) ? params[key].join(',') : String(params[key]);
+            return encodeURIComponent(key) + '=' + encodeURIComponent(value);
+        }).join('&');
+        return ['csv', 'parquet'].map(function (format) {
+            return path + '?format=' + format + (query ? '&' + query : '');
+        });
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        tennis: {
+            matchesExport: function (surfaces, series, courts, startDate, endDate) {
+                return exportUrls('/api/v1/export/matches', {
+                    surfaces: surfaces, series: series, courts: courts,
+                    start_date: startDate && String(startDate).slice(0, 10),
+                    end_date: endDate && String(endDate).slice(0, 10)
+                });
+            },
+
+            h2hExport: function (player1, player2) {
+                return exportUrls('/api/v1/export/h2h', {player1: player1, player2: player2});
+            },
+
+            seriesKings: function (cube, surfaces, series, courts, startDate, endDate) {
+                if (!cube || !(surfaces && surfaces.length && series && series.length &&
+                        courts && courts.length && startDate && endDate)) {
+                    return {};
+                }
+                var rows = decodeColumns(cube.kings);
+                var keep = rowFilter(cube, rows, surfaces, series, courts);
+                var range = dayRange(cube, cube.kings_days, startDate, endDate);
+                var wins = new Float64Array(cube.winners.length);
+                var seen = false;
+                for (var i = range[0]; i < range[1]; i++) {
+                    if (keep(i)) {
+                        wins[rows.w[i]] += rows.n[i];
+                        seen = true;
+                    }
+                }
+                if (!seen) {
+                    return clone(cube.empty_figure);
+                }
+                var top = [];
+                for (var w = 0; w < wins.length; w++) {
+                    if (wins[w] > 0) {
+                        top.push(w);
+                    }
+                }
+                top.sort(function (a, b) { return wins[b] - wins[a]; });
+                top = top.slice(0, 15).reverse();
+
+                var fig = clone(cube.kings_shell);
+                var trace = fig.data[0];
+                trace.x = top.map(function (w) { return wins[w]; });
+                trace.y = top.map(function (w) { return cube.winners[w]; });
+                trace.text = trace.x;
+                trace.marker = Object.assign({}, trace.marker, {color: trace.x});
+                return fig;
+            },
+
+            pathToVictory: function (cube, surfaces, series, courts, startDate, endDate) {
+                if (!cube || !(surfaces && surfaces.length && series && series.length &&
+                        courts && courts.length && startDate && endDate)) {
+                    return {};
+                }
+                var rows = decodeColumns(cube.paths);
+                var keep = rowFilter(cube, rows, surfaces, series, courts);
+                var range = dayRange(cube, cube.paths_days, startDate, endDate);
+                var nRounds = cube.rounds.length;
+                var nSets = cube.sets.length;
+                var leaves = new Float64Array(cube.surfaces.length * nRounds * nSets);
+                var seen = false;
+                for (var i = range[0]; i < range[1]; i++) {
+                    if (keep(i)) {
+                        leaves[(rows.s[i] * nRounds + rows.r[i]) * nSets + rows.t[i]] += rows.n[i];
+                        seen = true;
+                    }
+                }
+                if (!seen) {
+                    return clone(cube.empty_figure);
+                }
+
+                var ids = [], labels = [], parents = [], values = [];
+                cube.surfaces.forEach(function (surface, s) {
+                    var surfaceTotal = 0;
+                    cube.rounds.forEach(function (round, r) {
+                        var roundTotal = 0;
+                        cube.sets.forEach(function (sets, t) {
+                            var count = leaves[(s * nRounds + r) * nSets + t];
+                            if (count > 0) {
+                                ids.push(surface + '/' + round + '/' + sets);
+                                labels.push(sets);
+                                parents.push(surface + '/' + round);
+                                values.push(count);
+                                roundTotal += count;
+                            }
+                        });
+                        if (roundTotal > 0) {
+                            ids.push(surface + '/' + round);
+                            labels.push(round);
+                            parents.push(surface);
+                            values.push(roundTotal);
+                            surfaceTotal += roundTotal;
+                        }
+                    });
+                    if (surfaceTotal > 0) {
+                        ids.push(surface);
+                        labels.push(surface);
+                        parents.push('');
+                        values.push(surfaceTotal);
+                    }
+                });
+
+                var fig = clone(cube.paths_shell);
+                var trace = fig.data[0];
+                trace.ids = ids;
+                trace.labels = labels;
+                trace.parents = parents;
+                trace.values = values;
+                return fig;
+            }
+        }
+    });
+})();
@@ -0,0 +1,339 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+# Benchmarks measure the real work, so the shared figure cache is switched off.
+os.environ.setdefault('FIGURE_CACHE_MAX_MB', '0')
+
+import plotly.utils
+
+import app
+from query_backends import BACKENDS, make_backend
+
+
+def global_filters():
+    return [
+        ('surface-slicer', 'value', app.df['Surface'].dropna().unique().tolist()),
+        ('series-slicer', 'value', ['International']),
+        ('court-slicer', 'value', app.df['Court'].dropna().unique().tolist()),
+        ('date-range-slicer', 'start_date', str(app.df['Date'].min().date())),
+        ('date-range-slicer', 'end_date', str(app.df['Date'].max().date()))
+    ]
+
+
+def callback_inputs():
+    return {
+        'wins-treemap.figure': global_filters(),
+        'sunburst-chart.figure': global_filters(),
+        'odds-box-plot.figure': [('category-selector', 'value', 'Series')],
+        'timeline-chart.figure': [('player-slicer', 'value', 'Nadal R.'), ('year-slicer', 'value', 2015)],
+        'radar-chart.figure': [('player-slicer', 'value', 'Nadal R.')],
+        'player-kpi-row.children': [('player-slicer', 'value', 'Nadal R.')],
+        '1v1-results.children': [('player1-slicer', 'value', 'Federer R.'), ('player2-slicer', 'value', 'Nadal R.')]
+    }
+
+
+def figure_builders():
+    values = {output: [value for _, _, value in inputs] for output, inputs in callback_inputs().items()}
+    return [
+        ('update_treemap', app.update_treemap, values['wins-treemap.figure']),
+        ('update_sunburst', app.update_sunburst, values['sunburst-chart.figure']),
+        ('update_odds_distribution_histogram', app.update_odds_distribution_histogram, values['odds-box-plot.figure']),
+        ('update_timeline', app.update_timeline, values['timeline-chart.figure']),
+        ('update_radar', app.update_radar, values['radar-chart.figure']),
+        ('create_odds_time_series', app.create_odds_time_series, values['1v1-results.children']),
+        ('update_1v1_comparison', app.update_1v1_comparison, values['1v1-results.children'])
+    ]
+
+
+def callback_payload(output, inputs):
+    component_id, prop = output.rsplit('.', 1)
+    return {
+        'output': output,
+        'outputs': {'id': component_id, 'property': prop},
+        'inputs': [{'id': i, 'property': p, 'value': v} for i, p, v in inputs],
+        'changedPropIds': [],
+        'state': []
+    }
+
+
+def post_callback(client, output, inputs, headers=None):
+    return client.post('/_dash-update-component', json=callback_payload(output, inputs), headers=headers or {})
+
+
+def bench_wire(args):
+    client = app.server.test_client()
+    encodings = ['identity', 'gzip', 'br']
+    print(f"{'callback':32s}" + ''.join(f'{e:>12s}' for e in encodings))
+    for output, inputs in callback_inputs().items():
+        sizes = []
+        for encoding in encodings:
+            response = post_callback(client, output, inputs, {'Accept-Encoding': encoding})
+            sizes.append(len(response.data))
+        print(f'{output:32s}' + ''.join(f'{size:>12,d}' for size in sizes))
+
+
+def bench_callbacks(args):
+    client = app.server.test_client()
+    print(f"{'callback':32s}{'median ms':>12s}{'p95 ms':>12s}")
+    for output, inputs in callback_inputs().items():
+        # With --etag every request revalidates the first response, as a client
+        # holding a cached copy would; callbacks are POSTs, so each answer is a 412.
+        headers = {'If-None-Match': post_callback(client, output, inputs).headers['ETag']} if args.etag else None
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            post_callback(client, output, inputs, headers)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f'{output:32s}{statistics.median(timings):>12.1f}{p95:>12.1f}')
+
+
+def bench_figures(args):
+    print(f"{'builder':36s}{'median ms':>12s}{'min ms':>12s}")
+    for name, func, values in figure_builders():
+        func = getattr(func, '__wrapped__', func)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func(*values)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f'{name:36s}{statistics.median(timings):>12.2f}{min(timings):>12.2f}')
+
+
+def backend_queries():
+    filters = {
+        'surfaces': ['Hard', 'Clay'],
+        'series': ['International'],
+        'courts': app.df['Court'].dropna().unique().tolist(),
+        'start_date': str(app.df['Date'].min().date()),
+        'end_date': str(app.df['Date'].max().date())
+    }
+    return [
+        ('filter', lambda b: b.filter(['Surface', 'Round', 'Total_sets_needed'], **filters)),
+        ('group_count', lambda b: b.group_count(['Surface', 'Round'], **filters)),
+        ('top_k', lambda b: b.top_k('Winner', 15, **filters)),
+        ('player_matches', lambda b: b.player_matches('Nadal R.', ['Date', 'Tournament', 'Round', 'Winner'])),
+        ('h2h_matches', lambda b: b.h2h_matches('Federer R.', 'Nadal R.', ['Date', 'Round', 'Winner', 'Score']))
+    ]
+
+
+def bench_backends(args):
+    backends = []
+    for name in args.backends or list(BACKENDS):
+        path = os.path.join(tempfile.gettempdir(), f'tennis_bench_{app.DATASET_VERSION}.{name}')
+        try:
+            backends.append(make_backend(name, app.df, path=path, version=app.DATASET_VERSION))
+        except ImportError as e:
+            print(f'skipping {name}: {e}')
+    print(f"{'query':20s}" + ''.join(f'{b.name + " ms":>14s}' for b in backends))
+    for query, run in backend_queries():
+        medians = []
+        for backend in backends:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                run(backend)
+                timings.append((time.perf_counter() - start) * 1000)
+            medians.append(statistics.median(timings))
+        print(f'{query:20s}' + ''.join(f'{m:>14.2f}' for m in medians))
+
+
+def api_urls():
+    return [
+        '/api/v1/players?limit=100',
+        '/api/v1/series-kings?surfaces=Hard,Clay&series=International&limit=15',
+        '/api/v1/players/Nadal%20R./kpis',
+        '/api/v1/h2h?player1=Federer%20R.&player2=Nadal%20R.',
+        '/api/v1/odds-histogram?category=Series&limit=200'
+    ]
+
+
+def bench_api(args):
+    # Each worker thread gets its own test client; with --etag the requests carry
+    # the ETag from a first response, as a polling client would.
+    urls = api_urls()
+    etags = {}
+    if args.etag:
+        client = app.server.test_client()
+        etags = {url: client.get(url).headers['ETag'] for url in urls}
+
+    def worker(count):
+        client = app.server.test_client()
+        timings = []
+        for i in range(count):
+            url = urls[i % len(urls)]
+            headers = {'If-None-Match': etags[url]} if url in etags else {}
+            start = time.perf_counter()
+            response = client.get(url, headers=headers)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code in (200, 304), (url, response.status_code)
+        return timings
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(args.threads) as pool:
+        timings = sorted(t for chunk in pool.map(worker, [args.requests // args.threads] * args.threads) for t in chunk)
+    elapsed = time.perf_counter() - start
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f'{len(timings)} requests, {args.threads} threads: {len(timings) / elapsed:.0f} req/s, '
+          f'median {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms')
+
+
+def bench_coalesce(args):
+    # A burst of identical requests, all released at once: only the first should
+    # compute, the rest wait on it.
+    output = '1v1-results.children'
+    inputs = callback_inputs()[output]
+    barrier = threading.Barrier(args.threads)
+
+    def worker(_):
+        client = app.server.test_client()
+        barrier.wait()
+        start = time.perf_counter()
+        response = post_callback(client, output, inputs)
+        assert response.status_code == 200, response.status_code
+        return (time.perf_counter() - start) * 1000
+
+    before = app.callback_flights.stats()
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(args.threads) as pool:
+        timings = sorted(pool.map(worker, range(args.threads)))
+    elapsed = (time.perf_counter() - start) * 1000
+    after = app.callback_flights.stats()
+    print(f'{args.threads} concurrent requests in {elapsed:.0f} ms (median {statistics.median(timings):.1f} ms): '
+          f"{after['computed'] - before['computed']} computed, {after['coalesced'] - before['coalesced']} coalesced")
+
+
+def bench_throughput(args):
+    # Distinct sunburst requests (one end date each), so neither the figure cache
+    # nor coalescing can help; compare runs with different CALLBACK_PROCESSES.
+    if app.callback_pool is not None:
+        app.callback_pool.start()
+    end = app.df['Date'].max()
+    requests = []
+    for i in range(args.requests):
+        inputs = global_filters()
+        inputs[-1] = ('date-range-slicer', 'end_date', str((end - timedelta(days=i)).date()))
+        requests.append(inputs)
+
+    def worker(inputs):
+        client = app.server.test_client()
+        start = time.perf_counter()
+        response = post_callback(client, 'sunburst-chart.figure', inputs)
+        assert response.status_code == 200, response.status_code
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(args.threads) as pool:
+        timings = sorted(pool.map(worker, requests))
+    elapsed = time.perf_counter() - start
+    print(f'{len(timings)} requests, {args.threads} threads, {app.CALLBACK_PROCESSES} pool processes: '
+          f'{len(timings) / elapsed:.1f} req/s, median {statistics.median(timings):.0f} ms')
+
+
+def collect_components(node, components):
+    # {id: props} for every component in a serialized layout or callback response.
+    if isinstance(node, dict):
+        props = node.get('props')
+        if isinstance(props, dict) and isinstance(props.get('id'), str):
+            components[props['id']] = props
+        for value in node.values():
+            collect_components(value, components)
+    elif isinstance(node, list):
+        for value in node:
+            collect_components(value, components)
+
+
+def bench_first_load(args):
+    # Replays what the renderer does on a first visit: fetch the layout, then keep
+    # firing every server callback whose inputs and outputs are on the page until
+    # none are left, feeding each response back into the page.
+    client = app.server.test_client()
+    start = time.perf_counter()
+    response = client.get('/_dash-layout')
+    server_ms = (time.perf_counter() - start) * 1000
+    total_bytes = len(response.data)
+    components = {}
+    collect_components(response.get_json(), components)
+    if args.all_sections:
+        for section in app.LAYOUT_SECTIONS.values():
+            collect_components(json.loads(json.dumps(section, cls=plotly.utils.PlotlyJSONEncoder)), components)
+
+    fired = []
+    # Clientside callbacks run in the browser and cost no server time.
+    pending = {output: spec for output, spec in app.app.callback_map.items() if 'callback' in spec}
+    while True:
+        ready = [
+            output for output, spec in pending.items()
+            if all(o.component_id in components for o in (spec['output'] if isinstance(spec['output'], list) else [spec['output']]))
+            and all(i['id'] in components for i in spec['inputs'])
+        ]
+        if not ready:
+            break
+        for output in ready:
+            spec = pending.pop(output)
+            outputs = spec['output'] if isinstance(spec['output'], list) else [spec['output']]
+            payload = {
+                'output': output,
+                'outputs': [{'id': o.component_id, 'property': o.component_property} for o in outputs],
+                'inputs': [dict(i, value=components[i['id']].get(i['property'])) for i in spec['inputs']],
+                'changedPropIds': [],
+                'state': [dict(s, value=components.get(s['id'], {}).get(s['property'])) for s in spec['state']]
+            }
+            if not isinstance(spec['output'], list):
+                payload['outputs'] = payload['outputs'][0]
+            start = time.perf_counter()
+            response = client.post('/_dash-update-component', json=payload)
+            elapsed = (time.perf_counter() - start) * 1000
+            server_ms += elapsed
+            total_bytes += len(response.data)
+            fired.append((output, elapsed))
+            if response.status_code == 200:
+                for component_id, props in response.get_json()['response'].items():
+                    components.setdefault(component_id, {}).update(props)
+                    collect_components(props, components)
+
+    for output, elapsed in fired:
+        print(f'{output:70s}{elapsed:>10.1f} ms')
+    print(f'{len(fired)} callbacks on first load, {server_ms:.0f} ms server time, {total_bytes:,d} bytes')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Dashboard micro-benchmarks.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('wire', help='bytes on the wire per callback and content encoding').set_defaults(func=bench_wire)
+    callbacks = sub.add_parser('callbacks', help='end-to-end callback latency through the Flask test client')
+    callbacks.add_argument('--repeat', type=int, default=20)
+    callbacks.add_argument('--etag', action='store_true', help='send If-None-Match so responses are 412s')
+    callbacks.set_defaults(func=bench_callbacks)
+    figures = sub.add_parser('figures', help='figure construction time per builder, bypassing HTTP and caches')
+    figures.add_argument('--repeat', type=int, default=20)
+    figures.set_defaults(func=bench_figures)
+    backends = sub.add_parser('backends', help='query latency per backend for the query_backends interface')
+    backends.add_argument('--repeat', type=int, default=20)
+    backends.add_argument('backends', nargs='*', help='backends to compare (default: all)')
+    backends.set_defaults(func=bench_backends)
+    api = sub.add_parser('api', help='JSON API throughput under concurrent requests')
+    api.add_argument('--threads', type=int, default=8)
+    api.add_argument('--requests', type=int, default=2000)
+    api.add_argument('--etag', action='store_true', help='send If-None-Match so responses are 304s')
+    api.set_defaults(func=bench_api)
+    coalesce = sub.add_parser('coalesce', help='a burst of identical concurrent callback requests')
+    coalesce.add_argument('--threads', type=int, default=32)
+    coalesce.set_defaults(func=bench_coalesce)
+    throughput = sub.add_parser('throughput', help='distinct concurrent callback requests per second')
+    throughput.add_argument('--threads', type=int, default=8)
+    throughput.add_argument('--requests', type=int, default=64)
+    throughput.set_defaults(func=bench_throughput)
+    first_load = sub.add_parser('first-load', help='callbacks fired and server time for a first page visit')
+    first_load.add_argument('--all-sections', action='store_true', help='render every section up front, as before the tabs')
+    first_load.set_defaults(func=bench_first_load)
+    args = parser.parse_args()
+    args.func(args)
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import threading
+import time
+
+from local_db import thread_connection
+
+
+class DiskCache:
+    # A small LRU key/value store on top of sqlite. Every gunicorn worker on the
+    # host opens the same file, so a figure computed by one worker is served by all.
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, timeout=5.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+            'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+
+    def _connect(self):
+        return thread_connection(self._local, self._open)
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def get(self, key):
+        # A zero size cap switches the cache off, including entries that an
+        # earlier run with a larger cap left in the same file.
+        if self.max_bytes <= 0:
+            return None
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+            return row[0]
+        except sqlite3.Error:
+            return None
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        try:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                    (key, value, len(value), time.time())
+                )
+                self._evict(conn)
+                conn.execute('COMMIT')
+            except sqlite3.Error:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        to_free = total - self.max_bytes
+        victims = []
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY accessed ASC'):
+            victims.append((key,))
+            to_free -= size
+            if to_free <= 0:
+                break
+        conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+
+    def clear(self):
+        self._connect().execute('DELETE FROM entries')
+
+    def stats(self):
+        count, total = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+        ).fetchone()
+        return {'entries': count, 'bytes': total, 'max_bytes': self.max_bytes}
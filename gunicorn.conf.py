@@ -0,0 +1,9 @@
+# Read by gunicorn from the directory it is started in.
+
+
+def post_worker_init(worker):
+    # The worker has loaded the app but not started its request threads yet:
+    # the last single-threaded point at which it can fork its callback pool.
+    import app
+    if app.callback_pool is not None:
+        app.callback_pool.start()
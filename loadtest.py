@@ -0,0 +1,317 @@
+import argparse
+import collections
+import gzip
+import http.client
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+
+class InProcessTransport:
+    def __init__(self, server):
+        self.client = server.test_client()
+
+    def send(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body, headers={'Accept-Encoding': 'gzip'})
+        return response.status_code, response.headers.get('Content-Encoding'), response.data
+
+
+class HTTPTransport:
+    # One keep-alive connection per simulated user, as a browser tab would hold.
+    def __init__(self, url):
+        parsed = urllib.parse.urlsplit(url)
+        self.conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=120)
+
+    def send(self, method, path, body=None):
+        headers = {'Accept-Encoding': 'gzip'}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        try:
+            self.conn.request(method, path, body=data, headers=headers)
+            response = self.conn.getresponse()
+            return response.status, response.getheader('Content-Encoding'), response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            raise
+
+
+def decode(encoding, data):
+    if encoding == 'gzip':
+        data = gzip.decompress(data)
+    return json.loads(data) if data else None
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = collections.defaultdict(list)
+        self.errors = collections.Counter()
+        self.sessions = 0
+
+    def add(self, label, elapsed_ms, ok):
+        with self.lock:
+            self.timings[label].append(elapsed_ms)
+            if not ok:
+                self.errors[label] += 1
+
+
+def collect_components(node, components):
+    if isinstance(node, dict):
+        props = node.get('props')
+        if isinstance(props, dict) and isinstance(props.get('id'), str):
+            components[props['id']] = props
+        for value in node.values():
+            collect_components(value, components)
+    elif isinstance(node, list):
+        for value in node:
+            collect_components(value, components)
+
+
+def option_values(props):
+    return [o['value'] if isinstance(o, dict) else o for o in props.get('options') or []]
+
+
+class Page:
+    # Just enough of the Dash renderer to replay a session: it keeps the props of
+    # every component on the page and fires each server callback when one of its
+    # inputs changes or when its components first appear.
+
+    def __init__(self, transport, recorder, dependencies):
+        self.transport = transport
+        self.recorder = recorder
+        self.callbacks = [
+            dict(dep, outputs=dep['output'].strip('.').split('...'))
+            for dep in dependencies if not dep.get('clientside_function')
+        ]
+        self.components = {}
+        self.present = set()
+
+    def get(self, label, path):
+        start = time.perf_counter()
+        status, encoding, data = self.transport.send('GET', path)
+        self.recorder.add(label, (time.perf_counter() - start) * 1000, status < 400)
+        return encoding, data
+
+    def load(self):
+        self.get('index', '/')
+        collect_components(decode(*self.get('layout', '/_dash-layout')), self.components)
+        self.run(set())
+
+    def set(self, component_id, prop, value):
+        if component_id in self.components:
+            self.components[component_id][prop] = value
+            self.run({f'{component_id}.{prop}'})
+
+    def props(self, component_id):
+        return self.components.get(component_id, {})
+
+    def run(self, changed):
+        while True:
+            present = {
+                i for i, cb in enumerate(self.callbacks)
+                if all(o.rsplit('.', 1)[0] in self.components for o in cb['outputs'])
+                and all(inp['id'] in self.components for inp in cb['inputs'])
+            }
+            appeared, self.present = present - self.present, present
+            ready = []
+            for i in sorted(present):
+                cb = self.callbacks[i]
+                triggered = [f"{inp['id']}.{inp['property']}" for inp in cb['inputs']
+                             if f"{inp['id']}.{inp['property']}" in changed]
+                if triggered or (i in appeared and not cb.get('prevent_initial_call')):
+                    ready.append((cb, triggered))
+            if not ready:
+                return
+            changed = set()
+            for cb, triggered in ready:
+                changed |= self.fire(cb, triggered)
+
+    def fire(self, cb, triggered):
+        outputs = [{'id': o.rsplit('.', 1)[0], 'property': o.rsplit('.', 1)[1]} for o in cb['outputs']]
+        body = {
+            'output': cb['output'],
+            'outputs': outputs if len(outputs) > 1 else outputs[0],
+            'inputs': [dict(i, value=self.props(i['id']).get(i['property'])) for i in cb['inputs']],
+            'changedPropIds': triggered,
+            'state': [dict(s, value=self.props(s['id']).get(s['property'])) for s in cb['state']]
+        }
+        label = ' + '.join(cb['outputs'])
+        start = time.perf_counter()
+        status, encoding, data = self.transport.send('POST', '/_dash-update-component', body)
+        result = decode(encoding, data) if status == 200 else None
+        # Background callbacks answer with a job handle; poll it like the renderer does.
+        while result is not None and 'cacheKey' in result and 'response' not in result:
+            time.sleep(0.1)
+            query = urllib.parse.urlencode({'cacheKey': result['cacheKey'], 'job': result['job']})
+            status, encoding, data = self.transport.send('POST', f'/_dash-update-component?{query}', body)
+            result = decode(encoding, data) if status == 200 else None
+        self.recorder.add(label, (time.perf_counter() - start) * 1000, status < 400)
+
+        changed = set()
+        for component_id, props in ((result or {}).get('response') or {}).items():
+            component = self.components.setdefault(component_id, {})
+            for prop, value in props.items():
+                if prop == 'children':
+                    # Components replaced by new children leave the page.
+                    removed = {}
+                    collect_components(component.get('children'), removed)
+                    for old_id in removed:
+                        self.components.pop(old_id, None)
+                component[prop] = value
+                collect_components(value, self.components)
+                changed.add(f'{component_id}.{prop}')
+        return changed
+
+
+def zipf_sampler(players, exponent):
+    # Players ranked by wins, so the stars draw most of the traffic.
+    cum_weights = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, len(players) + 1)))
+    return lambda rng: rng.choices(players, cum_weights=cum_weights)[0]
+
+
+def session(page, rng, pick_player, deadline):
+    page.load()
+    steps = []
+
+    # Global filters on the overview tab.
+    for _ in range(rng.randint(1, 3)):
+        component_id = rng.choice(['surface-slicer', 'series-slicer', 'date-range-slicer'])
+        if component_id == 'date-range-slicer':
+            first, last = int(page.props(component_id)['start_date'][:4]), int(page.props(component_id)['end_date'][:4])
+            start, end = sorted(rng.sample(range(first, last + 1), 2))
+            steps.append((component_id, 'start_date', f'{start}-01-01'))
+            steps.append((component_id, 'end_date', f'{end}-12-31'))
+        else:
+            values = option_values(page.props(component_id))
+            steps.append((component_id, 'value', rng.sample(values, rng.randint(1, len(values)))))
+
+    steps.append(('section-tabs', 'value', 'odds'))
+    steps.append(('category-selector', 'value', rng.choice(['Surface', 'Series'])))
+
+    steps.append(('section-tabs', 'value', 'player'))
+    for _ in range(rng.randint(1, 3)):
+        steps.append(('player-slicer', 'value', pick_player(rng)))
+        if rng.random() < 0.5:
+            steps.append(('year-slicer', 'value', None))
+
+    steps.append(('section-tabs', 'value', 'h2h'))
+    for _ in range(rng.randint(1, 2)):
+        steps.append(('player1-slicer', 'value', pick_player(rng)))
+        steps.append(('player2-slicer', 'value', pick_player(rng)))
+
+    for component_id, prop, value in steps:
+        if time.monotonic() > deadline:
+            return
+        if component_id == 'year-slicer':
+            value = rng.choice(option_values(page.props(component_id)) or [None])
+        page.set(component_id, prop, value)
+
+
+def run_load(make_transport, args, label):
+    probe = make_transport()
+    _, encoding, data = probe.send('GET', '/_dash-dependencies')
+    dependencies = decode(encoding, data)
+    _, encoding, data = probe.send('GET', '/api/v1/series-kings?limit=1000&fields=player')
+    pick_player = zipf_sampler([row['player'] for row in decode(encoding, data)['data']], args.zipf)
+
+    recorder = Recorder()
+    deadline = time.monotonic() + args.duration
+
+    def user(index):
+        rng = random.Random(args.seed + index)
+        while time.monotonic() < deadline:
+            try:
+                session(Page(make_transport(), recorder, dependencies), rng, pick_player, deadline)
+            except (OSError, http.client.HTTPException):
+                recorder.add('connection', 0, False)
+                continue
+            with recorder.lock:
+                recorder.sessions += 1
+
+    start = time.monotonic()
+    users = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(args.users)]
+    for thread in users:
+        thread.start()
+    for thread in users:
+        thread.join()
+    report(recorder, label, args, time.monotonic() - start)
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def report(recorder, label, args, elapsed):
+    total = sum(len(t) for t in recorder.timings.values())
+    print(f'\n{label}: {args.users} users, {elapsed:.0f} s, {recorder.sessions} sessions, '
+          f'{total} requests, {total / elapsed:.1f} req/s, {sum(recorder.errors.values())} errors')
+    print(f"{'request':64s}{'count':>8s}{'req/s':>8s}{'p50 ms':>9s}{'p95 ms':>9s}{'p99 ms':>9s}{'max ms':>9s}{'errors':>8s}")
+    for name, timings in sorted(recorder.timings.items(), key=lambda item: -sum(item[1])):
+        timings.sort()
+        print(f'{name[:63]:64s}{len(timings):>8d}{len(timings) / elapsed:>8.1f}{percentile(timings, 0.5):>9.1f}'
+              f'{percentile(timings, 0.95):>9.1f}{percentile(timings, 0.99):>9.1f}{timings[-1]:>9.1f}{recorder.errors[name]:>8d}')
+
+
+def start_gunicorn(workers, threads, port, env):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:server', '--workers', str(workers), '--threads', str(threads),
+         '--bind', f'127.0.0.1:{port}', '--timeout', '120'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # Each worker loads the dataset on start; wait until the layout is served.
+    deadline = time.monotonic() + 600
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with {process.returncode}')
+        try:
+            if HTTPTransport(f'http://127.0.0.1:{port}').send('GET', '/_dash-layout')[0] == 200:
+                return process
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start in time')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay scripted dashboard sessions and report latency per callback.')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', help='load a running server, e.g. http://127.0.0.1:8050 (default: in-process)')
+    target.add_argument('--gunicorn', nargs='+', metavar='WORKERSxTHREADS',
+                        help='start gunicorn once per configuration, e.g. 1x8 2x4 4x1')
+    parser.add_argument('--users', type=int, default=8, help='concurrent simulated users')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per configuration')
+    parser.add_argument('--zipf', type=float, default=1.1, help='exponent of the player popularity distribution')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--port', type=int, default=8051)
+    parser.add_argument('--no-figure-cache', action='store_true', help='disable the shared figure cache in the server')
+    args = parser.parse_args()
+
+    if args.no_figure_cache:
+        os.environ['FIGURE_CACHE_MAX_MB'] = '0'
+    if args.url:
+        run_load(lambda: HTTPTransport(args.url), args, args.url)
+    elif args.gunicorn:
+        for config in args.gunicorn:
+            workers, threads = (int(n) for n in config.lower().split('x'))
+            process = start_gunicorn(workers, threads, args.port, dict(os.environ))
+            try:
+                run_load(lambda: HTTPTransport(f'http://127.0.0.1:{args.port}'), args,
+                         f'gunicorn {workers} workers x {threads} threads')
+            finally:
+                process.terminate()
+                process.wait()
+    else:
+        import app
+        if app.callback_pool is not None:
+            app.callback_pool.start()
+        run_load(lambda: InProcessTransport(app.server), args, 'in-process')
@@ -0,0 +1,23 @@
+import os
+
+
+def thread_connection(local, connect):
+    # sqlite connections must not cross threads or a fork, so keep one per (pid, thread).
+    conn = getattr(local, 'conn', None)
+    if conn is None or local.pid != os.getpid():
+        conn = local.conn = connect()
+        local.pid = os.getpid()
+    return conn
+
+
+def build_and_replace(path, build):
+    # The file is built under a private name and swapped in, so processes
+    # starting together never see it half-written or compete to write it.
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        build(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
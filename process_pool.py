@@ -0,0 +1,82 @@
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _noop():
+    return os.getpid()
+
+
+class CallbackPool:
+    # A pool of forked processes for GIL-bound callback work, so the pool
+    # processes inherit the loaded dataset copy-on-write. start() must run while
+    # the process is still single-threaded (a gunicorn worker's post_worker_init,
+    # or before the dev server starts): a fork from a threaded process can hand
+    # the children locks that other threads held at that moment.
+
+    def __init__(self, processes, queue_size, timeout):
+        self.processes = processes
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._owner = None
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(queue_size)
+
+    def start(self):
+        if self._owner == os.getpid():
+            return
+        executor = concurrent.futures.ProcessPoolExecutor(
+            self.processes, mp_context=multiprocessing.get_context('fork')
+        )
+        # Fork start launches every process on the first submit.
+        executor.submit(_noop).result()
+        self._executor = executor
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._owner = os.getpid()
+
+    def usable(self):
+        # Only the process that started the pool can talk to it; the pool
+        # processes, background jobs and any other forks run work inline.
+        return self._owner == os.getpid() and self._executor is not None
+
+    def run(self, func, *args):
+        slots = self._slots
+        if not slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f'Callback pool queue full for {self.timeout:g}s')
+        executor = self._executor
+        if executor is None:
+            slots.release()
+            return func(*args)
+        try:
+            future = executor.submit(func, *args)
+        except BaseException as e:
+            slots.release()
+            if isinstance(e, BrokenProcessPool):
+                self._broken(executor)
+            raise
+        # The slot is held until the work really finishes, so an abandoned
+        # request still counts against the queue.
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f'Callback did not finish within {self.timeout:g}s') from None
+        except BrokenProcessPool:
+            self._broken(executor)
+            raise
+
+    def _broken(self, broken):
+        # A pool process died. Forking a new pool from here, with request threads
+        # running, is what start() exists to avoid, so this worker runs callbacks
+        # inline until it is restarted.
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+        print(f'Callback pool process died in worker {os.getpid()}; running callbacks inline', file=sys.stderr)
+        broken.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,263 @@
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from local_db import build_and_replace, thread_connection
+
+FILTER_COLUMNS = {'surfaces': 'Surface', 'series': 'Series', 'courts': 'Court'}
+
+
+def date_bound(value):
+    return pd.Timestamp(value).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class PandasBackend:
+    # The in-memory frame every worker already holds; the reference the SQL
+    # backends are measured against.
+    name = 'pandas'
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def _mask(self, filters):
+        mask = pd.Series(True, index=self.frame.index)
+        for key, column in FILTER_COLUMNS.items():
+            if filters.get(key) is not None:
+                mask &= self.frame[column].isin(filters[key])
+        if filters.get('start_date') is not None:
+            mask &= self.frame['Date'] >= pd.Timestamp(filters['start_date'])
+        if filters.get('end_date') is not None:
+            mask &= self.frame['Date'] <= pd.Timestamp(filters['end_date'])
+        return mask
+
+    def filter(self, columns, **filters):
+        return self.frame.loc[self._mask(filters), columns].reset_index(drop=True)
+
+    def iter_filter(self, columns, chunk_size, **filters):
+        # Only the matching positions are kept; rows are copied out a chunk at a time.
+        positions = np.flatnonzero(self._mask(filters).to_numpy())
+        column_positions = self.frame.columns.get_indexer(columns)
+        for start in range(0, max(len(positions), 1), chunk_size):
+            yield self.frame.iloc[positions[start:start + chunk_size], column_positions].reset_index(drop=True)
+
+    def group_count(self, by, **filters):
+        counts = self.frame.loc[self._mask(filters)].groupby(by, sort=True).size()
+        return counts.rename('count').reset_index()
+
+    def top_k(self, column, k, **filters):
+        counts = self.frame.loc[self._mask(filters), column].value_counts()
+        counts = counts.rename_axis(column).rename('count').reset_index()
+        return counts.sort_values(['count', column], ascending=[False, True], kind='stable').head(k).reset_index(drop=True)
+
+    def player_matches(self, player_name, columns):
+        rows = self.frame[(self.frame['Player_1'] == player_name) | (self.frame['Player_2'] == player_name)]
+        return rows.sort_values('Date', kind='stable')[columns].reset_index(drop=True)
+
+    def h2h_matches(self, player1, player2, columns):
+        frame = self.frame
+        rows = frame[
+            ((frame['Player_1'] == player1) & (frame['Player_2'] == player2)) |
+            ((frame['Player_1'] == player2) & (frame['Player_2'] == player1))
+        ]
+        return rows.sort_values('Date', kind='stable')[columns].reset_index(drop=True)
+
+
+class SQLBackend(ABC):
+    # Shared SQL for the embedded engines. The table is written once per dataset
+    # version and then only read, so these queries run against one file on disk
+    # shared by the workers.
+    name = None
+
+    def __init__(self, frame, path, version):
+        self.path = path
+        self._local = threading.local()
+        if self._stored_version() != version:
+            self._load(frame, version)
+
+    def _stored_version(self):
+        try:
+            return self._query('SELECT version FROM meta').iloc[0, 0]
+        except Exception:
+            return None
+
+    @abstractmethod
+    def _load(self, frame, version):
+        pass
+
+    @abstractmethod
+    def _connect(self):
+        pass
+
+    def _query(self, sql, params=()):
+        cursor = self._connect().execute(sql, list(params))
+        columns = [column[0] for column in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    def _where(self, filters):
+        clauses, params = [], []
+        for key, column in FILTER_COLUMNS.items():
+            values = filters.get(key)
+            if values is not None:
+                clauses.append(f'{column} IN ({", ".join("?" * len(values))})' if values else '0 = 1')
+                params.extend(values)
+        if filters.get('start_date') is not None:
+            clauses.append('Date >= ?')
+            params.append(date_bound(filters['start_date']))
+        if filters.get('end_date') is not None:
+            clauses.append('Date <= ?')
+            params.append(date_bound(filters['end_date']))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def _frame(self, rows, columns):
+        if 'Date' in columns:
+            rows['Date'] = pd.to_datetime(rows['Date'])
+        return rows[columns]
+
+    def filter(self, columns, **filters):
+        where, params = self._where(filters)
+        rows = self._query(f'SELECT {", ".join(columns)} FROM matches{where} ORDER BY row_id', params)
+        return self._frame(rows, columns)
+
+    def iter_filter(self, columns, chunk_size, **filters):
+        where, params = self._where(filters)
+        # A cursor of its own, so the stream never shares one with other queries.
+        cursor = self._connect().cursor()
+        try:
+            cursor.execute(f'SELECT {", ".join(columns)} FROM matches{where} ORDER BY row_id', list(params))
+            names = [column[0] for column in cursor.description]
+            rows = cursor.fetchmany(chunk_size)
+            yield self._frame(pd.DataFrame.from_records(rows, columns=names), columns)
+            while rows:
+                rows = cursor.fetchmany(chunk_size)
+                if rows:
+                    yield self._frame(pd.DataFrame.from_records(rows, columns=names), columns)
+        finally:
+            cursor.close()
+
+    def group_count(self, by, **filters):
+        where, params = self._where(filters)
+        keys = ', '.join(by)
+        return self._query(
+            f'SELECT {keys}, COUNT(*) AS count FROM matches{where} GROUP BY {keys} ORDER BY {keys}', params
+        )
+
+    def top_k(self, column, k, **filters):
+        where, params = self._where(filters)
+        where += (' AND ' if where else ' WHERE ') + f'{column} IS NOT NULL'
+        return self._query(
+            f'SELECT {column}, COUNT(*) AS count FROM matches{where} '
+            f'GROUP BY {column} ORDER BY count DESC, {column} ASC LIMIT {int(k)}', params
+        )
+
+    def player_matches(self, player_name, columns):
+        # Two indexed lookups instead of an OR, which neither engine can serve from an index.
+        select = ', '.join(columns)
+        rows = self._query(
+            f'SELECT {select}, Date AS sort_date, row_id FROM matches WHERE Player_1 = ? '
+            f'UNION ALL SELECT {select}, Date AS sort_date, row_id FROM matches WHERE Player_2 = ? '
+            'ORDER BY sort_date, row_id', [player_name, player_name]
+        )
+        return self._frame(rows, columns)
+
+    def h2h_matches(self, player1, player2, columns):
+        select = ', '.join(columns)
+        rows = self._query(
+            f'SELECT {select}, Date AS sort_date, row_id FROM matches WHERE Player_1 = ? AND Player_2 = ? '
+            f'UNION ALL SELECT {select}, Date AS sort_date, row_id FROM matches WHERE Player_1 = ? AND Player_2 = ? '
+            'ORDER BY sort_date, row_id', [player1, player2, player2, player1]
+        )
+        return self._frame(rows, columns)
+
+
+def sql_table(frame):
+    table = frame.copy()
+    table['Date'] = table['Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    table.insert(0, 'row_id', range(len(table)))
+    return table
+
+
+SQL_INDEXES = [
+    ('matches_player_1', 'Player_1, Date'),
+    ('matches_player_2', 'Player_2, Date'),
+    ('matches_date', 'Date'),
+]
+
+
+class SQLiteBackend(SQLBackend):
+    name = 'sqlite'
+
+    def _connect(self):
+        return thread_connection(self._local, lambda: sqlite3.connect(self.path, isolation_level=None))
+
+    def _load(self, frame, version):
+        def build(tmp_path):
+            conn = sqlite3.connect(tmp_path, isolation_level=None)
+            try:
+                sql_table(frame).to_sql('matches', conn, if_exists='replace', index=False)
+                for name, columns in SQL_INDEXES:
+                    conn.execute(f'CREATE INDEX {name} ON matches ({columns})')
+                conn.execute('CREATE TABLE meta (version TEXT)')
+                conn.execute('INSERT INTO meta VALUES (?)', (version,))
+                conn.execute('ANALYZE')
+            finally:
+                conn.close()
+
+        build_and_replace(self.path, build)
+        self._local = threading.local()
+
+
+class DuckDBBackend(SQLBackend):
+    # DuckDB lets only one process open a file for writing, so workers only ever
+    # open the shared file read-only.
+    name = 'duckdb'
+
+    def _connect(self):
+        import duckdb
+        # One database handle per process, one cursor per thread on top of it.
+        if getattr(self, '_pid', None) != os.getpid():
+            self._db = duckdb.connect(self.path, read_only=True)
+            self._pid = os.getpid()
+            self._local = threading.local()
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            cursor = self._local.cursor = self._db.cursor()
+        return cursor
+
+    def _reopen(self):
+        if getattr(self, '_pid', None) is not None:
+            self._db.close()
+        self._pid = None
+
+    def _load(self, frame, version):
+        import duckdb
+
+        def build(tmp_path):
+            conn = duckdb.connect(tmp_path)
+            try:
+                conn.register('matches_frame', sql_table(frame))
+                conn.execute('CREATE TABLE matches AS SELECT * FROM matches_frame')
+                conn.unregister('matches_frame')
+                for name, columns in SQL_INDEXES:
+                    conn.execute(f'CREATE INDEX {name} ON matches ({columns})')
+                conn.execute('CREATE TABLE meta (version TEXT)')
+                conn.execute('INSERT INTO meta VALUES (?)', [version])
+            finally:
+                conn.close()
+
+        self._reopen()
+        build_and_replace(self.path, build)
+
+
+BACKENDS = {'pandas': PandasBackend, 'sqlite': SQLiteBackend, 'duckdb': DuckDBBackend}
+
+
+def make_backend(name, frame, path=None, version=None):
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown query backend {name!r}; expected one of {", ".join(BACKENDS)}')
+    if name == 'pandas':
+        return PandasBackend(frame)
+    return BACKENDS[name](frame, path, version)
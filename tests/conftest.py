@@ -0,0 +1,66 @@
+import importlib
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SURFACES = ['Hard', 'Clay', 'Grass', 'Carpet']
+SERIES = ['ATP250', 'ATP500', 'Masters 1000', 'Grand Slam']
+ROUNDS = ['1st Round', '2nd Round', 'Quarterfinals', 'Semifinals', 'Final']
+
+
+def synthetic_matches(seed=0, years=range(2012, 2018), tournaments=10, n_players=48):
+    # Knockout draws of 32 between players of fixed skill, with the gaps real
+    # data has: missing odds, missing break points and retirements.
+    rng = np.random.default_rng(seed)
+    names = [f'Player{i:02d} {chr(65 + i % 26)}.' for i in range(n_players)]
+    skill = rng.normal(0, 1, n_players)
+    rows = []
+    for year in years:
+        for t in range(tournaments):
+            start = pd.Timestamp(year, 1, 10) + pd.Timedelta(days=30 * t)
+            series = SERIES[t % len(SERIES)]
+            best_of = 5 if series == 'Grand Slam' else 3
+            entrants = list(rng.choice(n_players, 32, replace=False))
+            for r, round_name in enumerate(ROUNDS):
+                winners = []
+                for a, b in zip(entrants[0::2], entrants[1::2]):
+                    p = 1 / (1 + np.exp(skill[b] - skill[a]))
+                    a_won = rng.random() < p
+                    need = best_of // 2 + 1
+                    lost = int(rng.integers(0, need))
+                    sets = ['6-%d' % rng.integers(0, 5) for _ in range(need)] + ['%d-6' % rng.integers(0, 5) for _ in range(lost)]
+                    score = ' '.join(sets if a_won else [s[::-1] for s in sets])
+                    if rng.random() < 0.02:
+                        score += ' RET'
+                    rows.append(dict(
+                        Date=(start + pd.Timedelta(days=r)).date(), Player_1=names[a], Player_2=names[b],
+                        Winner=names[a] if a_won else names[b],
+                        Odd_1=round(max(1.01, 0.95 / p), 2) if rng.random() > 0.05 else -1,
+                        Odd_2=round(max(1.01, 0.95 / (1 - p)), 2),
+                        Surface=SURFACES[t % len(SURFACES)], Series=series, Court='Indoor' if t % 4 == 0 else 'Outdoor',
+                        Round=round_name, Total_sets_needed=need + lost, Score=score,
+                        Break_pts_1=int(rng.integers(0, 12)) if rng.random() > 0.1 else None,
+                        Break_pts_2=int(rng.integers(0, 12)) if rng.random() > 0.1 else None,
+                        Tournament=f'Tournament {t:02d} Open'
+                    ))
+                    winners.append(a if a_won else b)
+                entrants = winners
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    # app.py loads its dataset at import, so point it at a small synthetic one
+    # and keep its figure cache out of the shared file.
+    data_dir = tmp_path_factory.mktemp('data')
+    synthetic_matches().to_csv(data_dir / 'atp.csv', index=False)
+    os.environ['TENNIS_DATA_PATH'] = str(data_dir / 'atp.csv')
+    os.environ['FIGURE_CACHE_PATH'] = str(data_dir / 'figures.sqlite')
+    os.environ['FIGURE_CACHE_MAX_MB'] = '0'
+    sys.path.insert(0, ROOT)
+    return importlib.import_module('app')
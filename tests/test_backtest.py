@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+
+def reference_backtest(app, strategy):
+    # One strategy at a time, straight from the odds frame, with a plain
+    # cumulative sum and running peak.
+    frame = app.df_odds.sort_values('Date', kind='stable')
+    favorite_is_1 = (frame['Odd_1'] <= frame['Odd_2']).to_numpy()
+    player_1_won = (frame['Winner'] == frame['Player_1']).to_numpy()
+    favorite = strategy.get('side', 'Favorite') == 'Favorite'
+    odds = np.where(favorite_is_1 == favorite, frame['Odd_1'], frame['Odd_2']).astype(float)
+    won = (favorite_is_1 == player_1_won) == favorite
+    mask = (odds >= strategy.get('min_odds', 1.0)) & (odds <= strategy.get('max_odds', np.inf))
+    for key, column in [('surfaces', 'Surface'), ('series', 'Series'), ('rounds', 'Round')]:
+        if strategy.get(key):
+            mask &= frame[column].isin(strategy[key]).to_numpy()
+    cumulative = np.cumsum(np.where(won, odds - 1.0, -1.0)[mask])
+    peak = np.maximum(np.maximum.accumulate(cumulative), 0.0) if len(cumulative) else cumulative
+    return {
+        'bets': int(mask.sum()),
+        'hits': int(won[mask].sum()),
+        'profit': cumulative[-1] if len(cumulative) else 0.0,
+        'max_drawdown': (peak - cumulative).max() if len(cumulative) else 0.0,
+        'dates': frame['Date'].to_numpy()[mask],
+        'curve': cumulative
+    }
+
+
+def random_strategies(app, count, seed):
+    rng = np.random.default_rng(seed)
+    data = app.backtest_data
+    strategies = []
+    for _ in range(count):
+        strategy = {'side': str(rng.choice(app.BACKTEST_SIDES))}
+        for key, labels in [('surfaces', data['surfaces']), ('series', data['series_labels']), ('rounds', data['rounds'])]:
+            if rng.random() < 0.6:
+                strategy[key] = list(rng.choice(labels, rng.integers(0, len(labels) + 1), replace=False))
+        low = float(rng.uniform(1.0, 3.0))
+        strategy['min_odds'], strategy['max_odds'] = low, low + float(rng.uniform(0.1, 4.0))
+        strategies.append(strategy)
+    return strategies
+
+
+# Strategies that place no bets at all, at chunk starts, ends and in between.
+NO_BETS = [{'surfaces': ['Ice']}, {'min_odds': 500.0}, {'side': 'Underdog', 'max_odds': 1.0}]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 16, 64])
+def test_backtest_matches_reference(app, chunk_size):
+    strategies = [NO_BETS[0], {}] + random_strategies(app, 30, seed=chunk_size) + [NO_BETS[1]]
+    strategies[17:17] = [NO_BETS[2]]
+    result = app.backtest(strategies, with_curves=True, chunk_size=chunk_size)
+    for i, strategy in enumerate(strategies):
+        expected = reference_backtest(app, strategy)
+        assert result['bets'][i] == expected['bets'], strategy
+        assert result['hits'][i] == expected['hits'], strategy
+        np.testing.assert_allclose(result['profit'][i], expected['profit'], atol=1e-9)
+        np.testing.assert_allclose(result['max_drawdown'][i], expected['max_drawdown'], atol=1e-9)
+        np.testing.assert_array_equal(result['curves'][i]['dates'], expected['dates'])
+        np.testing.assert_allclose(result['curves'][i]['profit'], expected['curve'], atol=1e-9)
+        placed = max(expected['bets'], 1)
+        np.testing.assert_allclose(result['roi'][i], expected['profit'] / placed * 100, atol=1e-9)
+        np.testing.assert_allclose(result['hit_rate'][i], expected['hits'] / placed * 100)
+
+
+def test_backtest_without_strategies(app):
+    result = app.backtest([])
+    assert all(len(result[key]) == 0 for key in ['bets', 'hits', 'profit', 'max_drawdown', 'roi', 'hit_rate'])
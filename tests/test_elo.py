@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+ELO_COLUMNS = ['Elo_1', 'Elo_2', 'Surface_Elo_1', 'Surface_Elo_2']
+
+
+@pytest.mark.parametrize('cutoffs', [[0.5], [0.2, 0.6, 0.9], [0.0], [1.0]])
+def test_split_history_matches_full_run(app, cutoffs):
+    # Feeding the history in date-ordered batches, starting from an empty state
+    # that has to grow as new players appear, gives the same ratings as one pass.
+    dates = app.df['Date']
+    bounds = [dates.min() - pd.Timedelta(days=1)] + [dates.quantile(q) for q in cutoffs] + [dates.max()]
+    state = app.new_elo_state(0)
+    batches = [
+        app.update_elo(state, app.df[(dates > low) & (dates <= high)])
+        for low, high in zip(bounds[:-1], bounds[1:])
+    ]
+    ratings = pd.concat(batches).reindex(app.df.index)
+    np.testing.assert_array_equal(ratings.to_numpy(), app.df[ELO_COLUMNS].to_numpy())
+    np.testing.assert_array_equal(state['overall'], app.elo_state['overall'])
+    np.testing.assert_array_equal(state['surface'], app.elo_state['surface'])
+
+
+def test_batch_row_order_does_not_matter(app):
+    # Rows of one batch may come in any order; the engine sorts by date and round.
+    state = app.new_elo_state(len(app.all_players))
+    shuffled = app.df.sample(frac=1.0, random_state=0)
+    ratings = app.update_elo(state, shuffled).reindex(app.df.index)
+    np.testing.assert_array_equal(ratings.to_numpy(), app.df[ELO_COLUMNS].to_numpy())
+
+
+def test_growing_state_keeps_existing_ratings(app):
+    state = app.new_elo_state(3)
+    state['overall'][:] = [1600.0, 1400.0, 1550.0]
+    state['surface'][:] = np.arange(state['surface'].size).reshape(state['surface'].shape) + 1000.0
+    kept_overall, kept_surface = state['overall'].copy(), state['surface'].copy()
+    match = pd.DataFrame([{
+        'Date': pd.Timestamp('2020-01-01'), 'Round': 'Final', 'Surface': 'Clay',
+        'Player_1': 'New A.', 'Player_2': 'New B.', 'Winner': 'New A.', 'Player_1_id': 8, 'Player_2_id': 9
+    }])
+    ratings = app.update_elo(state, match)
+    assert state['overall'].shape == (10,) and state['surface'].shape == (len(app.SURFACES), 10)
+    np.testing.assert_array_equal(state['overall'][:3], kept_overall)
+    np.testing.assert_array_equal(state['surface'][:, :3], kept_surface)
+    np.testing.assert_array_equal(ratings.iloc[0].to_numpy(), [app.ELO_INITIAL] * 4)
+    assert state['overall'][8] > app.ELO_INITIAL > state['overall'][9]
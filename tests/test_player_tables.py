@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+PLAYER_TABLES = [
+    'player_matches', 'player_match_index', 'break_point_stats', 'career_cube',
+    'player_features', 'similarity_eligible', 'draws'
+]
+
+
+def load_player_tables(app, matches):
+    # The state app.py builds at import, for just these matches.
+    app.player_matches = app.add_form_columns(
+        app.player_match_rows(matches).sort_values(app.PLAYER_MATCH_ORDER, kind='stable')
+    )
+    app.player_match_index = app.index_player_matches(app.player_matches)
+    app.break_point_stats = app.build_break_point_stats(app.player_matches)
+    app.career_cube = app.build_career_cube(app.player_matches)
+    app.player_features, app.similarity_eligible = app.build_player_features(app.player_matches)
+    app.draws = app.build_draws(app.player_matches)
+    app.draw_options[:] = app.edition_options(app.draws)
+
+
+def assert_same(actual, expected):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert_same(actual[key], expected[key])
+    elif isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(actual, expected)
+    elif isinstance(expected, np.ndarray):
+        np.testing.assert_array_equal(actual, expected)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize('split', ['by_date', 'interleaved'])
+def test_refresh_matches_full_rebuild(app, split):
+    full = {name: getattr(app, name) for name in PLAYER_TABLES}
+    full_options = list(app.draw_options)
+    if split == 'by_date':
+        earlier = (app.df['Date'] < app.df['Date'].quantile(0.7)).to_numpy()
+    else:
+        # Late-arriving matches land between rows the players already have.
+        earlier = np.random.default_rng(1).random(len(app.df)) < 0.8
+    try:
+        load_player_tables(app, app.df[earlier])
+        app.refresh_player_tables(app.df[~earlier])
+        for name in PLAYER_TABLES:
+            assert_same(getattr(app, name), full[name])
+        assert app.draw_options == full_options
+    finally:
+        for name, value in full.items():
+            setattr(app, name, value)
+        app.draw_options[:] = full_options
+
+
+def test_refresh_touches_only_affected_players(app):
+    full = {name: getattr(app, name) for name in PLAYER_TABLES}
+    full_options = list(app.draw_options)
+    last = app.df.index[-1]
+    players = set(app.df.loc[[last], ['Player_1_id', 'Player_2_id']].to_numpy().ravel())
+    try:
+        load_player_tables(app, app.df.drop(index=last))
+        before = app.player_matches
+        table = app.update_player_form(before, app.df.loc[[last]])
+        untouched = ~table['Player_id'].isin(players)
+        pd.testing.assert_frame_equal(
+            table[untouched].reset_index(drop=True),
+            before[~before['Player_id'].isin(players)].reset_index(drop=True)
+        )
+    finally:
+        for name, value in full.items():
+            setattr(app, name, value)
+        app.draw_options[:] = full_options